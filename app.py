@@ -54,7 +54,7 @@ def build_candidate_response(index: int, vid: str, meta: Dict[str, Any], distanc
         "title": meta.get("title", "N/A"),
         "channel": meta.get("channel", "N/A"),
         "channel_id": meta.get("channel_id"),
-        "url": meta.get("url", "#"),
+        "url": meta.get("url") or (f"https://www.youtube.com/watch?v={vid}" if vid else "#"),
         "score": float(sim),
         "thumbnail": thumbnail,
         "channel_thumbnail": meta.get("channel_thumbnail"),
@@ -77,7 +77,7 @@ def build_candidate_video(index: int, vid: str, meta: Dict[str, Any], distance:
         duration=meta.get("duration"),
         duration_seconds=meta.get("duration_seconds"),
         tags=tags,
-        url=meta.get("url"),
+        url=meta.get("url") or (f"https://www.youtube.com/watch?v={vid}" if vid else None),
         similarity_score=cosine_distance_to_similarity(distance),
     )
 
@@ -119,14 +119,15 @@ def search():
     distances = search_results["distances"][0]
     metadatas = search_results["metadatas"][0]
     documents = search_results.get("documents", [[]])[0]
+    # Pad documents once and walk all four columns in a single zip pass
+    # instead of re-indexing each list per row
+    if len(documents) < len(result_ids):
+        documents = documents + [""] * (len(result_ids) - len(documents))
 
     candidates: List[Dict[str, Any]] = []
     candidate_video_objs: List[CandidateVideo] = []
 
-    for i, rid in enumerate(result_ids):
-        meta = metadatas[i]
-        dist = distances[i]
-        doc_text = documents[i] if i < len(documents) else ""
+    for i, (rid, dist, meta, doc_text) in enumerate(zip(result_ids, distances, metadatas, documents)):
         vid = meta.get("id") or rid
         candidates.append(build_candidate_response(i, vid, meta, dist, doc_text))
         candidate_video_objs.append(build_candidate_video(i, vid, meta, dist, doc_text))
@@ -212,8 +213,9 @@ def channel_videos():
     if not channel:
         return jsonify({"error": "channel parameter required"}), 400
 
-    vectordb = VectorDBService(path=CHROMA_DB_PATH, collection_name=CHROMA_COLLECTION_NAME)
-    videos = vectordb.get_videos_by_channel(channel)
+    # Reuse the startup service: its lazy channel index only pays off if the
+    # instance survives across requests
+    videos = vectordb_service.get_videos_by_channel(channel)
 
     shaped: List[Dict[str, Any]] = []
     for v in videos:
@@ -43,9 +43,11 @@ def run_search_cli():
                     meta = metadatas[i]
                     dist = distances[i]
                     score = 1 - dist if dist is not None and dist <= 2 else 0
+                    vid = meta.get('id') or result_ids[i]
+                    url = meta.get('url') or (f"https://www.youtube.com/watch?v={vid}" if vid else 'N/A')
                     print(f"\n{i+1}. (Score: {score:.4f}) {meta.get('title', 'N/A')}")
                     print(f"   Channel: {meta.get('channel', 'N/A')}")
-                    print(f"   URL: {meta.get('url', 'N/A')}")
+                    print(f"   URL: {url}")
             elif search_results:
                 print("No relevant videos found for that query.")
             else:
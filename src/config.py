@@ -16,15 +16,42 @@ TASK_TYPE_RETRIEVAL_DOCUMENT = "RETRIEVAL_DOCUMENT"
 TASK_TYPE_RETRIEVAL_QUERY = "RETRIEVAL_QUERY"
 
 YOUTUBE_API_BATCH_SIZE = 50
-YOUTUBE_API_DELAY = 0.1
+YOUTUBE_API_DELAY = 0.0  # fixed pacing off; rate limiting is reactive (backoff on 429/quota 403)
+YOUTUBE_FETCH_WORKERS = 8  # concurrent API round-trips (quota is per-unit, not per-connection)
+YOUTUBE_BATCH_HTTP_SUBREQUESTS = 50  # sub-requests multiplexed per /batch POST (Google's limit)
+YOUTUBE_USE_AIOHTTP = True  # direct REST fan-out when aiohttp is installed; else batched client
+YOUTUBE_RPS = 10  # leaky-bucket rate for the async path (burst up to this, then drip)
+CHANNEL_THUMBS_CACHE_PATH = os.path.join(ROOT_DIR, 'data', 'channel_thumbs.json')
+CHANNEL_THUMBS_TTL_DAYS = 30  # thumbnails rarely change; refetch after this
+VIDEO_DETAILS_CACHE_PATH = os.path.join(ROOT_DIR, 'data', 'video_details_cache.json')
+VIDEO_DETAILS_TTL_DAYS = 7  # snippet/contentDetails are near-static; refetch after this
+VIDEO_ETAGS_CACHE_PATH = os.path.join(ROOT_DIR, 'data', 'video_etags.json')  # If-None-Match revalidation
 
 EMBEDDING_BATCH_SIZE = 80
 EMBEDDING_API_DELAY = 15.1
 
 CHROMA_COLLECTION_NAME = "youtube_videos_gemini_std_v2"
 CHROMA_BATCH_SIZE = 100
+CHROMA_QUANTIZE = 'none'  # 'none' | 'int8' scalar quantization of stored vectors (~4x smaller)
+CHROMA_UPSERT_WORKERS = 4  # concurrent upsert batches (I/O-bound on SQLite transactions)
+CHROMA_READ_WORKERS = 8  # concurrent batched reads (get_items)
+CHROMA_ITEMS_CACHE_SIZE = 4096  # LRU entries for recently fetched items (get_items)
+
+# HNSW index tuning (applied when the collection is first created).
+# Higher M / construction_ef improve recall at build-time cost; search_ef
+# trades query latency against recall (~40 fast, ~200 recall-critical).
+# 'ip' space with pre-normalized vectors is equivalent to cosine but skips
+# the per-distance norm computations; takes effect on new collections only.
+HNSW_SPACE = 'ip'
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 128
+HNSW_SEARCH_EF = 100
 
 DEFAULT_SEARCH_RESULTS = 40
+QUERY_CACHE_SIZE = 1024  # LRU entries for repeated vector queries
+QUERY_CACHE_SIMILARITY = 0.98  # cosine threshold for serving a cached result to a near-duplicate query
+SEARCH_CACHE_TTL_SECONDS = 600  # memoized (query, n_results) search results; skips the embedding call
+SEARCH_CACHE_SIZE = 128
 
 # --- LLM Re-Ranking Configuration ---
 ENABLE_LLM_RERANK = True
@@ -65,13 +92,17 @@ TOPIC_CLUSTERING_SNAPSHOT_PATH = os.path.join(ROOT_DIR, 'data', 'topic_clusters.
 TOPIC_CLUSTERING_ENABLE_LLM_LABELS = False  # set True to use LLM labels
 TOPIC_CLUSTERING_DEBUG = True  # verbose clustering diagnostics
 TOPIC_CLUSTERING_LLM_MODEL = 'gemini-2.5-flash-lite'
+TOPIC_CLUSTERING_LLM_CONCURRENCY = 4  # parallel labeling requests (bounded by API quota)
 TOPIC_CLUSTERING_DIM_REDUCTION = 'pca'  # 'none' | 'pca' (future: 'umap')
 TOPIC_CLUSTERING_PCA_MAX_COMPONENTS = 50
+TOPIC_CLUSTERING_QUANTIZE = 'fp16'  # 'none' | 'fp16' storage for reduced embeddings
+TOPIC_CLUSTERING_ASSUME_NORMALIZED = True  # Gemini embeddings are unit-norm; skip re-normalizing
 TOPIC_CLUSTERING_PCA_VARIANCE_THRESHOLD = 0.90
 TOPIC_CLUSTERING_SHOW_NOISE = False  # UI default: hide noise cluster
 TOPIC_CLUSTERING_MAX_EXEMPLAR_TITLE_CHARS = 140
 TOPIC_CLUSTERING_REBUILD_ON_START_IF_MISSING = True
 TOPIC_CLUSTERING_MAX_MICRO_CLUSTER_SIZE = 2  # for optional UI aggregation only
+TOPIC_CLUSTERING_DBCV_MAX_N = 4000  # skip DBCV above this size (O(N^2) distance matrix)
 TOPIC_CLUSTERING_NOISE_RATIO_RETRY_THRESHOLD = 0.40
 TOPIC_CLUSTERING_LOW_CLUSTER_COUNT_RETRY_THRESHOLD = 2
 TOPIC_CLUSTERING_ADAPTIVE_MIN_SAMPLES_FACTOR = 0.75  # multiply min_samples when retrying due to high noise
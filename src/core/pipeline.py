@@ -96,11 +96,11 @@ class DataIngestionPipeline:
                 except Exception as arch_e:
                     print(f"Archive Warning: Failed to archive missing videos: {arch_e}")
             if video_details:
-                documents_to_embed = self._prepare_text_documents(video_details)
-                if documents_to_embed:
-                    embeddings, doc_ids, texts = self.embedding_service.embed_documents(documents_to_embed)
+                all_doc_ids, all_texts, all_metadatas = self._prepare_text_documents(video_details)
+                if all_doc_ids:
+                    embeddings, doc_ids, texts = self.embedding_service.embed_documents(all_doc_ids, all_texts)
                     if embeddings:
-                        metadata_map = {doc['id']: doc['metadata'] for doc in documents_to_embed}
+                        metadata_map = dict(zip(all_doc_ids, all_metadatas))
                         metadata_for_storage = [metadata_map[id] for id in doc_ids if id in metadata_map]
                         
                         processed_metadatas_for_chroma = []
@@ -122,9 +122,12 @@ class DataIngestionPipeline:
                             processed_metadatas_for_chroma.append(processed_item)
 
                         if (len(embeddings) == len(doc_ids) == len(texts) == len(processed_metadatas_for_chroma)):
-                            self.vectordb_service.upsert_documents(
-                                embeddings, doc_ids, processed_metadatas_for_chroma, texts
-                            )
+                            # Relax SQLite durability for the bulk write; the
+                            # ingestion run can simply be re-run if interrupted
+                            with self.vectordb_service.bulk_ingest_mode():
+                                self.vectordb_service.upsert_documents(
+                                    embeddings, doc_ids, processed_metadatas_for_chroma, texts
+                                )
                         else:
                             print("Error: Mismatch in lengths of data to be stored. Skipping storage of new videos.")
         else:
@@ -193,7 +196,12 @@ class DataIngestionPipeline:
             return None
 
     def _prepare_text_documents(self, video_details_list):
-        processed_docs = []
+        """Build parallel id/text/metadata columns for the embedding step.
+
+        Columnar output lets embed_documents slice the text list directly
+        instead of unpacking a wrapper dict per document.
+        """
+        doc_ids, texts, metadatas = [], [], []
         print("Preparing text documents for embedding (including titles)...")
         for video in video_details_list:
             doc_id = video.get('id')
@@ -216,10 +224,8 @@ class DataIngestionPipeline:
             text_to_embed = "\n".join(text_parts)
             text_to_embed = text_to_embed.replace('\r', '\n').replace('\n\n', '\n')
 
-            processed_docs.append({
-                'id': doc_id,
-                'text': text_to_embed.strip(),
-                'metadata': video
-            })
-        print(f"Prepared {len(processed_docs)} documents with titles included in text.")
-        return processed_docs
+            doc_ids.append(doc_id)
+            texts.append(text_to_embed.strip())
+            metadatas.append(video)
+        print(f"Prepared {len(doc_ids)} documents with titles included in text.")
+        return doc_ids, texts, metadatas
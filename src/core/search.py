@@ -1,17 +1,57 @@
 # src/core/search.py
+import threading
+import time
+from collections import OrderedDict
+
 from src.services.embedding_service import EmbeddingService
 from src.services.vectordb_service import VectorDBService
+from src import config
 from src.config import DEFAULT_SEARCH_RESULTS, EMBEDDING_MODEL_NAME, TASK_TYPE_RETRIEVAL_QUERY, GEMINI_API_KEY, CHROMA_DB_PATH, CHROMA_COLLECTION_NAME
 
+# Shared service instances: constructing EmbeddingService/VectorDBService per
+# call threw away the Chroma client (and all its caches) on every search.
+_embedding_service = None
+_vectordb_service = None
+_services_lock = threading.Lock()
+
+# Memoized search results keyed by (query, n_results): repeated or re-submitted
+# queries skip the embedding API round-trip entirely.
+_search_cache: "OrderedDict[tuple, tuple[float, dict]]" = OrderedDict()
+_search_cache_lock = threading.Lock()
+
+
+def _get_services():
+    global _embedding_service, _vectordb_service
+    if _embedding_service is None or _vectordb_service is None:
+        with _services_lock:
+            if _embedding_service is None:
+                _embedding_service = EmbeddingService(api_key=GEMINI_API_KEY, model_name=EMBEDDING_MODEL_NAME)
+            if _vectordb_service is None:
+                _vectordb_service = VectorDBService(path=CHROMA_DB_PATH, collection_name=CHROMA_COLLECTION_NAME)
+    return _embedding_service, _vectordb_service
+
+
 def search_videos(query: str, n_results: int = DEFAULT_SEARCH_RESULTS):
     """Performs semantic search using Gemini query embedding and ChromaDB."""
     if not query:
         print("Please provide a search query.")
         return None
 
+    ttl = getattr(config, 'SEARCH_CACHE_TTL_SECONDS', 600)
+    max_entries = getattr(config, 'SEARCH_CACHE_SIZE', 128)
+    cache_key = (query.strip().lower(), n_results)
+
+    with _search_cache_lock:
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            stored_at, results = cached
+            if time.monotonic() - stored_at < ttl:
+                _search_cache.move_to_end(cache_key)
+                return results
+            del _search_cache[cache_key]
+
     try:
-        embedding_service = EmbeddingService(api_key=GEMINI_API_KEY, model_name=EMBEDDING_MODEL_NAME)
-        vectordb_service = VectorDBService(path=CHROMA_DB_PATH, collection_name=CHROMA_COLLECTION_NAME)
+        embedding_service, vectordb_service = _get_services()
 
         print(f"Embedding query: '{query}'...")
         query_embedding = embedding_service.embed_query(query)
@@ -25,6 +65,12 @@ def search_videos(query: str, n_results: int = DEFAULT_SEARCH_RESULTS):
             query_embedding=query_embedding,
             n_results=n_results
         )
+
+        if results is not None:
+            with _search_cache_lock:
+                _search_cache[cache_key] = (time.monotonic(), results)
+                while len(_search_cache) > max_entries:
+                    _search_cache.popitem(last=False)
         return results
 
     except Exception as e:
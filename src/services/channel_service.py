@@ -45,12 +45,12 @@ class ChannelAggregationService:
         with self._rebuild_lock:
             start = time.time()
             try:
-                metadatas = self.vectordb.get_all_metadatas()
-                total = len(metadatas)
+                total = 0
                 counts: Dict[str, Dict[str, Any]] = {}
-                for m in metadatas:
+                for m in self.vectordb.iter_meta_rows():
+                    total += 1
                     try:
-                        channel = self._normalize_channel(m.get('channel'))
+                        channel = self._normalize_channel(m.channel)
                         thumb = m.get('channel_thumbnail') or None
                         dur = m.get('duration_seconds')
                         try:
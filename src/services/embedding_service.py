@@ -49,30 +49,29 @@ class EmbeddingService:
             print(f"Error embedding query '{query}': {e}")
             return None
 
-    def embed_documents(self, documents: List[Dict[str, Any]]) -> Tuple[List[list], List[str], List[str]]:
+    def embed_documents(self, doc_ids: List[str], texts: List[str]) -> Tuple[List[list], List[str], List[str]]:
         """
-        Generates embeddings for a list of documents.
+        Generates embeddings for parallel id/text columns.
 
         Args:
-            documents (List[Dict[str, Any]]): A list of dicts, where each dict
-                                              must have 'id' and 'text' keys.
+            doc_ids (List[str]): Document IDs, aligned with `texts`.
+            texts (List[str]): The texts to embed.
 
         Returns:
             Tuple[List[list], List[str], List[str]]: A tuple containing the
             list of embeddings, list of document IDs, and list of original texts.
         """
-        if not documents:
+        if not texts:
             return [], [], []
 
         all_embeddings, all_doc_ids, all_texts = [], [], []
         embedding_errors = 0
-        
-        print(f"Generating embeddings for {len(documents)} documents using model: {self.model_name}...")
 
-        for i in tqdm(range(0, len(documents), config.EMBEDDING_BATCH_SIZE), desc="Embedding Batches"):
-            batch_docs = documents[i:i + config.EMBEDDING_BATCH_SIZE]
-            batch_texts = [doc['text'] for doc in batch_docs]
-            batch_ids = [doc['id'] for doc in batch_docs]
+        print(f"Generating embeddings for {len(texts)} documents using model: {self.model_name}...")
+
+        for i in tqdm(range(0, len(texts), config.EMBEDDING_BATCH_SIZE), desc="Embedding Batches"):
+            batch_texts = texts[i:i + config.EMBEDDING_BATCH_SIZE]
+            batch_ids = doc_ids[i:i + config.EMBEDDING_BATCH_SIZE]
 
             if not batch_texts:
                 continue
@@ -1,15 +1,19 @@
+import hashlib
 import json
 import os
+import queue
+import tempfile
 import time
 import math
 import threading
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 load_dotenv()
 import numpy as np
-from sklearn.preprocessing import normalize as l2_normalize
 from sklearn.decomposition import PCA
+from sklearn.metrics.pairwise import euclidean_distances
 import re  # retained only for light text cleaning in LLM prompt truncation
 
 try:
@@ -17,9 +21,28 @@ try:
 except ImportError as e:  # pragma: no cover - dependency guard
     hdbscan = None  # Allow import error to raise later when used
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional fast JSON; stdlib fallback below
+    orjson = None
+
 from src import config
 from src.services.vectordb_service import VectorDBService
 
+_EMPTY_META: Dict[str, Any] = {}  # shared fallback; avoids a dict allocation per row
+_TEXT_CAP = 15  # sample texts retained per cluster for LLM labeling
+_WS_RE = re.compile(r'\s+')
+
+
+class ClusterLabel(BaseModel):
+    id: int = Field(..., description="Cluster id as provided")
+    label: str = Field(..., description="<=4 word concise human readable topic label")
+    keywords: List[str] = Field(..., description="Representative lowercase keywords")
+
+
+class ClusterLabelSet(BaseModel):
+    clusters: List[ClusterLabel]
+
 
 @dataclass
 class ClusterMetrics:
@@ -39,6 +62,19 @@ class TopicClusteringService:
         self.snapshot_path = getattr(config, 'TOPIC_CLUSTERING_SNAPSHOT_PATH', os.path.join(config.ROOT_DIR, 'data', 'topic_clusters.json'))
         self._lock = threading.Lock()
         self._snapshot_cache: Optional[Dict[str, Any]] = None
+        self._snapshot_bytes: Optional[bytes] = None
+        # Inverted index cluster_id -> member video ids, derived lazily from the
+        # snapshot so get_cluster avoids an O(N) assignments scan per request
+        self._cluster_to_members: Optional[Dict[int, List[str]]] = None
+        # Memoized sorted cluster lists keyed by sort mode for get_topics
+        self._sorted_views: Dict[str, List[Dict[str, Any]]] = {}
+        # Short-TTL cache of vectordb.count() so polling needs_rebuild calls
+        # don't hit the DB every time: (monotonic timestamp, count)
+        self._count_cache: Tuple[float, int] = (0.0, -1)
+        # Disk cache for PCA-reduced embeddings, keyed by corpus fingerprint
+        # (mirrors the snapshot caching pattern above).
+        self._reduced_cache_path = os.path.splitext(self.snapshot_path)[0] + '_reduced'
+        self._corpus_fingerprint: Optional[str] = None
 
     # ---------------- Snapshot Handling -----------------
     def load_snapshot(self) -> Optional[Dict[str, Any]]:
@@ -46,8 +82,12 @@ class TopicClusteringService:
             return self._snapshot_cache
         try:
             if os.path.exists(self.snapshot_path):
-                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                if orjson is not None:
+                    with open(self.snapshot_path, 'rb') as f:
+                        data = orjson.loads(f.read())
+                else:
+                    with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
                 if isinstance(data, dict):
                     self._snapshot_cache = data
                     return data
@@ -59,10 +99,22 @@ class TopicClusteringService:
         os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
         tmp_path = self.snapshot_path + '.tmp'
         try:
-            with open(tmp_path, 'w', encoding='utf-8') as f:
-                json.dump(snapshot, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                payload = orjson.dumps(snapshot, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                payload = json.dumps(snapshot, ensure_ascii=False, indent=2).encode('utf-8')
+            if payload == self._snapshot_bytes:
+                # No-op write: keep the existing file and just refresh the cache
+                self._snapshot_cache = snapshot
+                return
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
             os.replace(tmp_path, self.snapshot_path)
             self._snapshot_cache = snapshot
+            self._snapshot_bytes = payload
+            self._cluster_to_members = None  # derived caches are stale now
+            self._sorted_views = {}
+            self._count_cache = (0.0, -1)
         finally:
             if os.path.exists(tmp_path):  # cleanup leftover on error
                 try:
@@ -70,12 +122,37 @@ class TopicClusteringService:
                 except OSError:
                     pass
 
+    def _cluster_index(self, snap: Dict[str, Any]) -> Dict[int, List[str]]:
+        """Build (once) and return the cluster_id -> member ids inverted index."""
+        if self._cluster_to_members is None:
+            index: Dict[int, List[str]] = {}
+            a_ids = snap.get('assignment_ids')
+            a_labels = snap.get('assignment_labels')
+            if a_ids and a_labels:  # version >= 2: parallel arrays, grouped in NumPy
+                labels_arr = np.asarray(a_labels)
+                order = np.argsort(labels_arr, kind='stable')
+                sorted_labels = labels_arr[order]
+                uniq, starts = np.unique(sorted_labels, return_index=True)
+                ends = np.append(starts[1:], sorted_labels.size)
+                for lbl, s, e in zip(uniq.tolist(), starts.tolist(), ends.tolist()):
+                    index[int(lbl)] = [a_ids[i] for i in order[s:e]]
+            else:  # legacy snapshots stored a video_id -> label dict
+                for vid, lbl in (snap.get('assignments') or {}).items():
+                    index.setdefault(int(lbl), []).append(vid)
+            self._cluster_to_members = index
+        return self._cluster_to_members
+
     def needs_rebuild(self) -> bool:
         snap = self.load_snapshot()
         if not snap:
             return True
         try:
-            total_videos = self.vectordb.count()
+            ts, cached_count = self._count_cache
+            if cached_count >= 0 and time.monotonic() - ts < 2.0:
+                total_videos = cached_count
+            else:
+                total_videos = self.vectordb.count()
+                self._count_cache = (time.monotonic(), int(total_videos))
             # Ensure both values are plain Python integers to avoid numpy array comparison issues
             snap_total = snap.get('total_videos', -1)
             if isinstance(snap_total, (list, tuple)) and len(snap_total) > 0:
@@ -96,17 +173,34 @@ class TopicClusteringService:
         # Chroma does not expose streaming embeddings easily via existing wrapper; pull in batches
         batch_size = getattr(config, 'CHROMA_BATCH_SIZE', 100)
         ids: List[str] = []
-        embeddings: List[List[float]] = []
         texts: List[str] = []
-        offset = 0
+        # Embeddings go straight into one pre-allocated float32 matrix; building a
+        # list-of-lists first would double peak memory for large collections.
+        X: Optional[np.ndarray] = None
+        row = 0
         # Use raw client for efficiency
         collection = self.vectordb.collection
-        while offset < total:
-            limit = min(batch_size, total - offset)
-            try:
-                batch = collection.get(include=['embeddings', 'metadatas', 'documents'], offset=offset, limit=limit)
-            except Exception as e:
-                print(f"Error retrieving embeddings batch at offset {offset}: {e}")
+        # Prefetch batches on a worker thread so the next Chroma round-trip
+        # overlaps with parsing the current batch. Bounded queue caps memory.
+        batch_queue: "queue.Queue[Any]" = queue.Queue(maxsize=2)
+        _SENTINEL = object()
+
+        def _prefetch():
+            for offset in range(0, total, batch_size):
+                limit = min(batch_size, total - offset)
+                try:
+                    batch = collection.get(include=['embeddings', 'metadatas', 'documents'], offset=offset, limit=limit)
+                except Exception as e:
+                    print(f"Error retrieving embeddings batch at offset {offset}: {e}")
+                    break
+                batch_queue.put(batch)
+            batch_queue.put(_SENTINEL)
+
+        worker = threading.Thread(target=_prefetch, daemon=True)
+        worker.start()
+        while True:
+            batch = batch_queue.get()
+            if batch is _SENTINEL:
                 break
             got_ids = batch.get('ids', [])
             # Some vector DB clients may return numpy arrays for ids; ensure list
@@ -116,11 +210,9 @@ class TopicClusteringService:
                 got_ids = []
                 
             embs = batch.get('embeddings', [])
-            if isinstance(embs, np.ndarray):
-                embs = embs.tolist()
-            elif embs is None:
+            if embs is None:
                 embs = []
-                
+
             metas = batch.get('metadatas', [])
             if isinstance(metas, np.ndarray):
                 metas = metas.tolist()
@@ -132,54 +224,137 @@ class TopicClusteringService:
                 docs = docs.tolist()
             elif docs is None:
                 docs = []
+            if X is None and len(embs) > 0:
+                dim = len(embs[0])
+                X = np.empty((total, dim), dtype=np.float32)
+            if X is not None and len(got_ids) > 0:
+                n_rows = min(len(got_ids), len(embs))
+                if n_rows:
+                    X[row:row + n_rows] = np.asarray(embs[:n_rows], dtype=np.float32)
+                if n_rows < len(got_ids):  # defensive: zero-fill rows missing an embedding
+                    X[row + n_rows:row + len(got_ids)] = 0.0
             for i, vid in enumerate(got_ids):
                 ids.append(vid)
-                if i < len(embs):
-                    embeddings.append(embs[i])
-                else:
-                    embeddings.append([0.0])
                 # Build text for labeling: title + channel + truncated description
-                meta = metas[i] if i < len(metas) and isinstance(metas[i], dict) else {}
+                meta = metas[i] if i < len(metas) and isinstance(metas[i], dict) else _EMPTY_META
                 title = (meta.get('title') or '').strip()
                 channel = (meta.get('channel') or '').strip()
                 description = (meta.get('description') or '')[:200].strip()
-                piece_parts = []
-                if title:
-                    piece_parts.append(title)
-                if channel:
-                    piece_parts.append(channel)
-                if description:
-                    piece_parts.append(description)
-                texts.append(' \n '.join(piece_parts))
-            offset += len(got_ids)
-            if len(got_ids) == 0:
-                break
-        X = np.asarray(embeddings, dtype=np.float32)
+                texts.append(' \n '.join(filter(None, (title, channel, description))))
+            row += len(got_ids)
+        worker.join()
+        if X is None:
+            X = np.zeros((len(ids), 0), dtype=np.float32)
+        elif row < total:  # trim if any batches came back short
+            X = X[:row]
+        # Fingerprint the corpus so preprocess_embeddings can reuse a cached
+        # PCA reduction across rebuilds where nothing has changed.
+        fp_source = ''.join(sorted(ids)) + str(total) + str(getattr(config, 'EMBEDDING_MODEL_NAME', ''))
+        self._corpus_fingerprint = hashlib.blake2b(fp_source.encode('utf-8')).hexdigest()[:16]
         return ids, X, texts
 
     # ---------------- Preprocessing & Params -----------------
+    @staticmethod
+    def _reduction_settings() -> Dict[str, Any]:
+        """Config values that change what the reduction produces.
+
+        Stored alongside the cached matrix so tuning any of them invalidates
+        the cache instead of silently serving the previous reduction.
+        """
+        return {
+            'dim_reduction': getattr(config, 'TOPIC_CLUSTERING_DIM_REDUCTION', 'pca'),
+            'pca_max_components': getattr(config, 'TOPIC_CLUSTERING_PCA_MAX_COMPONENTS', 50),
+            'pca_variance_threshold': getattr(config, 'TOPIC_CLUSTERING_PCA_VARIANCE_THRESHOLD', 0.90),
+            'quantize': getattr(config, 'TOPIC_CLUSTERING_QUANTIZE', 'none'),
+        }
+
+    def _load_reduced_cache(self) -> Optional[Tuple[np.ndarray, Dict[str, Any]]]:
+        """Return cached (X_proc, info) if the on-disk reduction matches the current corpus."""
+        if not self._corpus_fingerprint:
+            return None
+        npy_path = self._reduced_cache_path + '.npy'
+        meta_path = self._reduced_cache_path + '.json'
+        try:
+            if not (os.path.exists(npy_path) and os.path.exists(meta_path)):
+                return None
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if not isinstance(meta, dict) or meta.get('fingerprint') != self._corpus_fingerprint:
+                return None
+            if meta.get('settings') != self._reduction_settings():
+                return None  # reduction config changed; recompute
+            # mmap keeps RSS flat; downstream consumers only read the matrix
+            X_proc = np.load(npy_path, mmap_mode='r')
+            return X_proc, {"pca_components": meta.get('pca_components')}
+        except Exception as e:
+            print(f"Warning: failed to load reduced embedding cache: {e}")
+            return None
+
+    def _save_reduced_cache(self, X_proc: np.ndarray, info: Dict[str, Any]) -> None:
+        if not self._corpus_fingerprint:
+            return
+        try:
+            os.makedirs(os.path.dirname(self._reduced_cache_path), exist_ok=True)
+            np.save(self._reduced_cache_path + '.npy', X_proc)
+            with open(self._reduced_cache_path + '.json', 'w', encoding='utf-8') as f:
+                json.dump({'fingerprint': self._corpus_fingerprint,
+                           'settings': self._reduction_settings(),
+                           'pca_components': info.get('pca_components')}, f)
+        except Exception as e:
+            print(f"Warning: failed to persist reduced embedding cache: {e}")
+
+    @staticmethod
+    def _looks_normalized(X: np.ndarray) -> bool:
+        """Cheaply detect unit-norm embeddings by sampling the first rows."""
+        sample_norms = np.linalg.norm(X[:min(128, X.shape[0])], axis=1)
+        return bool(np.allclose(sample_norms, 1.0, atol=1e-3))
+
     def preprocess_embeddings(self, X: np.ndarray) -> Tuple[np.ndarray, Dict[str, Any]]:
         if X.size == 0:
             return X, {"pca_components": 0}
-        Xn = l2_normalize(X)
+        cached = self._load_reduced_cache()
+        if cached is not None:
+            if getattr(config, 'TOPIC_CLUSTERING_DEBUG', False):
+                print("[topic-cluster] reusing cached PCA-reduced embeddings")
+            return cached
+        if getattr(config, 'TOPIC_CLUSTERING_ASSUME_NORMALIZED', False) or self._looks_normalized(X):
+            # Embedding model already emits unit vectors; skip the N*D pass
+            Xn = X
+        else:
+            # L2-normalize in place: X was just materialized by load_embeddings and is
+            # not shared, so avoid sklearn.normalize allocating a full copy
+            norms = np.linalg.norm(X, axis=1, keepdims=True)
+            np.maximum(norms, 1e-12, out=norms)
+            Xn = np.divide(X, norms, out=X if X.base is None else X.copy())
         pca_choice = getattr(config, 'TOPIC_CLUSTERING_DIM_REDUCTION', 'pca')
         info: Dict[str, Any] = {"pca_components": None}
         if pca_choice == 'pca' and Xn.shape[0] > 0:
             n = Xn.shape[0]
             dim = Xn.shape[1]
-            if n > 3000 or dim > 384:
+            # HDBSCAN handles low-dimensional data fine; skip PCA when already compact
+            if dim > 64 and (n > 3000 or dim > 384):
                 max_comp = getattr(config, 'TOPIC_CLUSTERING_PCA_MAX_COMPONENTS', 50)
                 target = min(max_comp, dim, max(10, int(0.1 * n)))
                 var_threshold = getattr(config, 'TOPIC_CLUSTERING_PCA_VARIANCE_THRESHOLD', 0.90)
-                pca = PCA(n_components=target, svd_solver='auto', random_state=42)
-                Xr = pca.fit_transform(Xn)
+                # Randomized SVD is much faster than full LAPACK SVD on these shapes
+                pca = PCA(n_components=target, svd_solver='randomized', n_iter=4, random_state=42)
+                Xr = pca.fit_transform(Xn).astype(np.float32, copy=False)
                 # Determine minimal components reaching threshold
                 cumvar = np.cumsum(pca.explained_variance_ratio_)
-                k = int(np.searchsorted(cumvar, var_threshold) + 1)
+                mask = cumvar >= var_threshold
+                # argmax of the boolean mask finds the first crossing; if the
+                # threshold is never reached keep every component (the old
+                # searchsorted form returned len+1 in that case)
+                k = int(mask.argmax()) + 1 if mask.any() else cumvar.size
                 if k < Xr.shape[1]:
                     Xr = Xr[:, :k]
                 info['pca_components'] = Xr.shape[1]
-                return Xr.astype(np.float32, copy=False), info
+                # At <=50 dims fp16 is well within cluster-stability tolerance and
+                # halves both the cache file and the working set
+                if getattr(config, 'TOPIC_CLUSTERING_QUANTIZE', 'none') == 'fp16':
+                    Xr = Xr.astype(np.float16, copy=False)
+                self._save_reduced_cache(Xr, info)
+                return Xr, info
         info['pca_components'] = Xn.shape[1]
         return Xn.astype(np.float32, copy=False), info
 
@@ -206,23 +381,26 @@ class TopicClusteringService:
         return {"min_cluster_size": mcs, "min_samples": ms}
 
     # ---------------- Core Clustering -----------------
-    def run_hdbscan(self, X: np.ndarray, params: Dict[str, int], selection_method: str = 'leaf') -> Tuple[np.ndarray, Optional[np.ndarray], Any]:
+    def run_hdbscan(self, X: np.ndarray, params: Dict[str, int], selection_method: str = 'leaf', memory: Any = None) -> Tuple[np.ndarray, Optional[np.ndarray], Any]:
         if hdbscan is None:
             raise RuntimeError("hdbscan package not installed")
         if X.size == 0:
             return np.array([], dtype=int), None, None
+        if X.dtype == np.float16:  # hdbscan does not accept fp16 input directly
+            X = X.astype(np.float32)
         clusterer = hdbscan.HDBSCAN(
             min_cluster_size=params['min_cluster_size'],
             min_samples=params['min_samples'],
             metric='euclidean',
             cluster_selection_method=selection_method,
-            prediction_data=True
+            prediction_data=True,
+            **({'memory': memory} if memory is not None else {})
         )
         labels = clusterer.fit_predict(X)
         probs = getattr(clusterer, 'probabilities_', None)
         return labels, probs, clusterer
 
-    def evaluate(self, labels: np.ndarray, probs: Optional[np.ndarray], X: np.ndarray, params: Dict[str, int], start_time: float) -> ClusterMetrics:
+    def evaluate(self, labels: np.ndarray, probs: Optional[np.ndarray], X: np.ndarray, params: Dict[str, int], start_time: float, precomputed_D2: Optional[np.ndarray] = None) -> ClusterMetrics:
         if labels.size == 0:
             return ClusterMetrics(cluster_count=0, noise_ratio=0.0, validity_score=None, build_seconds=0.0)
         noise_mask = labels == -1
@@ -231,35 +409,73 @@ class TopicClusteringService:
         unique = [l for l in np.unique(labels) if l != -1]
         cluster_count = len(unique)
         validity_score = None
-        # Try DBCV using hdbscan validity utils
-        if hdbscan is not None and cluster_count > 1:
+        dbcv_max_n = getattr(config, 'TOPIC_CLUSTERING_DBCV_MAX_N', 4000)
+        # Try DBCV using hdbscan validity utils; it is diagnostic only, so skip
+        # when no shared distance matrix exists and N would make it O(N^2).
+        if hdbscan is not None and cluster_count > 1 and (precomputed_D2 is not None or X.shape[0] <= dbcv_max_n):
             try:
                 from hdbscan.validity import validity_index
                 # Filter noise for validity - ensure proper boolean array handling
                 non_noise_indices = np.where(~noise_mask)[0]
                 if len(non_noise_indices) > 2:
-                    core_X = X[non_noise_indices]
                     core_labels = labels[non_noise_indices]
                     if len(np.unique(core_labels)) > 1:
-                        validity_score = float(validity_index(core_X, core_labels))
+                        if precomputed_D2 is not None:
+                            # Reuse the per-rebuild squared-distance matrix instead of
+                            # recomputing pairwise distances on every adaptive retry
+                            core_D = np.sqrt(precomputed_D2[np.ix_(non_noise_indices, non_noise_indices)])
+                            # d defaults to the matrix width, which for a
+                            # precomputed matrix is N, not the embedding
+                            # dimensionality — pass the real d or the DBCV
+                            # exponentiation over/underflows
+                            validity_score = float(validity_index(
+                                core_D, core_labels, metric='precomputed', d=X.shape[1]))
+                        else:
+                            core_X = X[non_noise_indices]
+                            validity_score = float(validity_index(core_X, core_labels))
             except Exception:
                 validity_score = None
         build_seconds = time.time() - start_time
         return ClusterMetrics(cluster_count=cluster_count, noise_ratio=noise_ratio, validity_score=validity_score, build_seconds=build_seconds)
 
     # ---------------- Labeling -----------------
-    def _build_cluster_members(self, labels: np.ndarray, probs: Optional[np.ndarray], ids: List[str], texts: List[str]) -> Dict[int, Dict[str, Any]]:
+    def _build_cluster_members(self, labels: np.ndarray, probs: Optional[np.ndarray], ids: List[str], texts: Optional[List[str]] = None) -> Dict[int, Dict[str, Any]]:
         clusters: Dict[int, Dict[str, Any]] = {}
-        for idx, label in enumerate(labels):
-            # Convert numpy scalar to Python int to avoid ambiguous truth value
-            label_val = int(label)
+        if labels.size == 0:
+            return clusters
+        # Group sample indices per label in NumPy instead of a per-sample Python loop
+        order = np.argsort(labels, kind='stable')
+        sorted_labels = labels[order]
+        uniq, starts = np.unique(sorted_labels, return_index=True)
+        ends = np.append(starts[1:], sorted_labels.size)
+        for label_val, start, end in zip(uniq.tolist(), starts.tolist(), ends.tolist()):
             if label_val == -1:  # skip noise for cluster stats (kept in assignments separately)
                 continue
-            entry = clusters.setdefault(label_val, {"members": [], "probs": [], "texts": []})
-            entry["members"].append(ids[idx])
-            entry["texts"].append(texts[idx])
-            if probs is not None:
-                entry["probs"].append(float(probs[idx]))
+            member_idx = order[start:end]
+            # Cap retained texts at collection time; the labeler only ever uses a
+            # small sample, preferring the highest-probability members
+            if texts is None:
+                cluster_texts: List[str] = []
+            elif probs is not None and member_idx.size > _TEXT_CAP:
+                top_idx = member_idx[np.argsort(probs[member_idx])[-_TEXT_CAP:][::-1]]
+                cluster_texts = [texts[i] for i in top_idx]
+            else:
+                cluster_texts = [texts[i] for i in member_idx[:_TEXT_CAP]]
+            # Preformat the LLM prompt block here so repeated labeling passes
+            # don't re-clean the same texts
+            sample_lines = []
+            for t in cluster_texts:
+                clean = _WS_RE.sub(' ', t).strip()
+                if len(clean) > 140:
+                    clean = clean[:140] + '…'
+                if clean:
+                    sample_lines.append(f"- {clean}")
+            clusters[int(label_val)] = {
+                "members": [ids[i] for i in member_idx],
+                "texts": cluster_texts,
+                "prompt_block": "\n".join(sample_lines) if sample_lines else "- (no content)",
+                "probs": probs[member_idx].astype(float).tolist() if probs is not None else [],
+            }
         # exemplar selection based on highest probability
         for cid, data in clusters.items():
             if data["members"]:
@@ -291,16 +507,6 @@ class TopicClusteringService:
         """Batch LLM labeling. Single or chunked calls; no heuristic fallback (per user request)."""
         try:
             from google import genai
-            from pydantic import BaseModel, Field
-            from typing import List
-
-            class ClusterLabel(BaseModel):
-                id: int = Field(..., description="Cluster id as provided")
-                label: str = Field(..., description="<=4 word concise human readable topic label")
-                keywords: List[str] = Field(..., description=f"Up to {max_kw} representative lowercase keywords")
-
-            class ClusterLabelSet(BaseModel):
-                clusters: List[ClusterLabel]
 
             client = genai.Client(api_key=config.GEMINI_API_KEY)
             model_name = getattr(config, 'TOPIC_CLUSTERING_LLM_MODEL', 'gemini-2.5-flash')
@@ -308,6 +514,7 @@ class TopicClusteringService:
             # Split into manageable batches to control token size
             cluster_items = list(clusters.items())
             batch_size = 25
+            tasks: List[Tuple[List[Tuple[int, Dict[str, Any]]], str]] = []
             for start in range(0, len(cluster_items), batch_size):
                 batch_slice = cluster_items[start:start+batch_size]
                 # Build prompt segment
@@ -319,62 +526,79 @@ class TopicClusteringService:
                     "Input clusters:" 
                 ]
                 for cid, data in batch_slice:
-                    texts = data.get('texts', [])[:15]
-                    sample_lines = []
-                    for t in texts:
-                        clean = re.sub(r'\s+', ' ', t).strip()
-                        if len(clean) > 140:
-                            clean = clean[:140] + '…'
-                        if clean:
-                            sample_lines.append(f"- {clean}")
-                    if not sample_lines:
-                        sample_lines.append("- (no content)")
-                    parts.append(f"Cluster {cid}:\n" + "\n".join(sample_lines))
+                    parts.append(f"Cluster {cid}:\n" + (data.get('prompt_block') or "- (no content)"))
                 parts.append("Respond with JSON: {\"clusters\": [ {\"id\":..., \"label\":..., \"keywords\":[...]}, ... ] }")
-                prompt = "\n\n".join(parts)
+                tasks.append((batch_slice, "\n\n".join(parts)))
 
-                response = client.models.generate_content(
-                    model=model_name,
-                    contents=prompt,
-                    config={
-                        "response_mime_type": "application/json",
-                        "response_schema": ClusterLabelSet,
-                    }
-                )
-
-                parsed = getattr(response, 'parsed', None)
-                if not parsed and getattr(response, 'text', None):
-                    # Attempt manual JSON parse (strip fences if any)
-                    import json as _json
-                    txt = response.text.strip()
+            def _call_llm(prompt: str):
+                # Each call is seconds of network wait; retried with exponential
+                # backoff on transient API errors (429/5xx)
+                last_exc: Optional[Exception] = None
+                for attempt in range(3):
+                    try:
+                        return client.models.generate_content(
+                            model=model_name,
+                            contents=prompt,
+                            config={
+                                "response_mime_type": "application/json",
+                                "response_schema": ClusterLabelSet,
+                            }
+                        )
+                    except Exception as call_e:
+                        last_exc = call_e
+                        msg = str(call_e)
+                        if any(code in msg for code in ('429', '500', '503')) and attempt < 2:
+                            time.sleep((2 ** attempt) + np.random.uniform(0, 0.5))
+                            continue
+                        raise
+                raise last_exc  # pragma: no cover - unreachable
+
+            def _parse_clusters(response) -> Optional[List[Dict[str, Any]]]:
+                # Happy path: the response is already schema-constrained JSON, so
+                # parse the text directly instead of running pydantic validators
+                txt = getattr(response, 'text', None)
+                if txt:
+                    txt = txt.strip()
                     if txt.startswith("```"):
                         # remove markdown fences
                         txt = re.sub(r'^```[a-zA-Z]*', '', txt)
                         txt = txt.rstrip('`').strip()
                     try:
-                        raw = _json.loads(txt)
-                        class _Tmp(BaseModel):
-                            clusters: List[ClusterLabel]
-                        parsed = _Tmp(**raw)
+                        raw = orjson.loads(txt) if orjson is not None else json.loads(txt)
+                        if isinstance(raw, dict) and isinstance(raw.get('clusters'), list):
+                            return raw['clusters']
                     except Exception:
-                        parsed = None
+                        pass
+                # Fallback: SDK-validated pydantic object
+                parsed = getattr(response, 'parsed', None)
+                if parsed is not None:
+                    return [{'id': c.id, 'label': c.label, 'keywords': c.keywords} for c in parsed.clusters]
+                return None
 
-                if not parsed:
+            def _apply_response(batch_slice, response):
+                entries = _parse_clusters(response)
+                if not entries:
                     if getattr(config, 'TOPIC_CLUSTERING_DEBUG', False):
                         print("[topic-cluster] LLM batch parse failed; using placeholders for this batch")
                     for cid, data in batch_slice:
                         data['label'] = f"cluster_{cid}"
                         data['top_keywords'] = []
-                    continue
+                    return
 
                 # Map results
-                label_map = {c.id: c for c in parsed.clusters}
+                label_map = {}
+                for c in entries:
+                    if isinstance(c, dict) and c.get('id') is not None:
+                        try:
+                            label_map[int(c['id'])] = c
+                        except (TypeError, ValueError):
+                            continue
                 for cid, data in batch_slice:
                     cobj = label_map.get(cid)
                     if cobj:
-                        data['label'] = (cobj.label or f"cluster_{cid}").strip()[:60]
+                        data['label'] = (cobj.get('label') or f"cluster_{cid}").strip()[:60]
                         # Normalize keywords
-                        kws = [k.strip().lower() for k in (cobj.keywords or []) if k.strip()]
+                        kws = [k.strip().lower() for k in (cobj.get('keywords') or []) if isinstance(k, str) and k.strip()]
                         # Deduplicate preserving order
                         seen = set()
                         final_kws = []
@@ -388,6 +612,23 @@ class TopicClusteringService:
                     else:
                         data['label'] = f"cluster_{cid}"
                         data['top_keywords'] = []
+
+            # Overlap the network-bound calls; batches touch disjoint cluster
+            # dicts so merging results as they arrive is safe
+            max_workers = max(1, getattr(config, 'TOPIC_CLUSTERING_LLM_CONCURRENCY', 4))
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks) or 1)) as executor:
+                futures = {executor.submit(_call_llm, prompt): batch_slice for batch_slice, prompt in tasks}
+                for fut in as_completed(futures):
+                    batch_slice = futures[fut]
+                    try:
+                        _apply_response(batch_slice, fut.result())
+                    except Exception as batch_e:
+                        if getattr(config, 'TOPIC_CLUSTERING_DEBUG', False):
+                            print(f"[topic-cluster] LLM batch failed; using placeholders: {batch_e}")
+                        for cid, data in batch_slice:
+                            data['label'] = f"cluster_{cid}"
+                            data['top_keywords'] = []
         except Exception as e:
             if getattr(config, 'TOPIC_CLUSTERING_DEBUG', False):
                 print(f"[topic-cluster] LLM labeling failed globally: {e}")
@@ -399,29 +640,29 @@ class TopicClusteringService:
 
     # ---------------- Snapshot Build -----------------
     def build_snapshot(self, ids: List[str], labels: np.ndarray, probs: Optional[np.ndarray], metrics: ClusterMetrics, params: Dict[str, int], pca_info: Dict[str, Any], labeled_clusters: Optional[Dict[int, Dict[str, Any]]] = None) -> Dict[str, Any]:
-        assignments: Dict[str, int] = {}
-        for i, vid in enumerate(ids):
-            # Defensive assignment to avoid numpy array truthiness issues
-            try:
-                if i < len(labels):
-                    assignments[vid] = int(labels[i])
-                else:
-                    assignments[vid] = -1
-            except (IndexError, ValueError):
-                assignments[vid] = -1
-        
+        # Assignments as parallel arrays (SoA): smaller JSON and cheaper to
+        # serialize / reverse-index than a per-video dict
+        n = min(len(ids), int(labels.size))
+        assignment_labels: List[int] = np.asarray(labels[:n]).astype(np.int32).tolist()
+        if n < len(ids):  # defensive: pad videos without a label as noise
+            assignment_labels.extend([-1] * (len(ids) - n))
+
+
         # Use provided labeled_clusters or build them
         if labeled_clusters is not None:
             clusters_raw = labeled_clusters
         else:
-            clusters_raw = self._build_cluster_members(labels, probs, ids, [""] * len(ids))  # texts not needed here; labeling done earlier
+            clusters_raw = self._build_cluster_members(labels, probs, ids)  # texts not needed here; labeling done earlier
         total_videos = len(ids)
+        # Cluster sizes straight from the label array in one NumPy pass
+        uniq, counts = np.unique(labels[labels != -1], return_counts=True)
+        size_map = dict(zip(uniq.tolist(), counts.tolist()))
         cluster_entries: List[Dict[str, Any]] = []
         # Rebuild with labels & keywords by referencing cluster labels produced earlier (we label after building members with texts)
         # The labeling adds 'label' and 'top_keywords'. We'll integrate those after labeling stage externally.
         for cid, data in clusters_raw.items():
             members = data['members']
-            size = len(members)
+            size = size_map.get(cid, len(members))
             percent = (size / total_videos * 100.0) if total_videos else 0.0
             cluster_entries.append({
                 'id': cid,
@@ -434,6 +675,7 @@ class TopicClusteringService:
                 'sample_video_ids': members[:3]
             })
         snapshot = {
+            'version': 2,
             'generated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
             'embedding_model': getattr(config, 'EMBEDDING_MODEL_NAME', 'unknown'),
             'algo': 'hdbscan',
@@ -446,7 +688,8 @@ class TopicClusteringService:
             'cluster_count': metrics.cluster_count,
             'noise_ratio': round(metrics.noise_ratio, 4),
             'clusters': cluster_entries,
-            'assignments': assignments,
+            'assignment_ids': ids,
+            'assignment_labels': assignment_labels,
             'meta': {
                 'build_seconds': round(metrics.build_seconds, 3),
                 'validity_score': metrics.validity_score,
@@ -476,16 +719,37 @@ class TopicClusteringService:
                 if getattr(config, 'TOPIC_CLUSTERING_DEBUG', False):
                     print(f"[topic-cluster] initial params={base_params} pca_components={pca_info.get('pca_components')} proc_shape={X_proc.shape}")
 
+                # Shared squared-distance matrix so each adaptive retry's DBCV
+                # evaluation reuses the same pairwise distances
+                D2 = None
+                dbcv_max_n = getattr(config, 'TOPIC_CLUSTERING_DBCV_MAX_N', 4000)
+                if 0 < X_proc.shape[0] <= dbcv_max_n:
+                    try:
+                        D2 = euclidean_distances(X_proc, squared=True)
+                    except Exception as dist_e:
+                        print(f"Warning: failed to precompute distance matrix for DBCV: {dist_e}")
+
                 # Adaptive multi-pass strategy
                 target_min = max(15, min(80, len(ids)//120))  # dynamic acceptable cluster lower bound
                 max_iters = 6
                 floor_ = getattr(config, 'TOPIC_CLUSTERING_MIN_CLUSTER_SIZE_FLOOR', 5)
                 best_state = None  # (metrics, labels, probs, params, selection_method)
                 params = base_params.copy()
+                # Pin min_samples to its smallest candidate up front: the expensive
+                # mutual-reachability MST depends only on (X, min_samples), so with a
+                # shared joblib cache every retry reuses it and pays only the cheap
+                # condensed-tree extraction for the new min_cluster_size / method.
+                params['min_samples'] = max(3, int(floor_ * 0.35))
+                hdbscan_cache_dir = tempfile.mkdtemp(prefix='hdbscan_mst_')
+                try:
+                    from joblib import Memory
+                    hdbscan_memory = Memory(location=hdbscan_cache_dir, verbose=0)
+                except Exception:
+                    hdbscan_memory = None
                 selection_method = 'leaf'
                 for it in range(max_iters):
-                    labels, probs, _model = self.run_hdbscan(X_proc, params, selection_method=selection_method)
-                    metrics = self.evaluate(labels, probs, X_proc, params, start)
+                    labels, probs, _model = self.run_hdbscan(X_proc, params, selection_method=selection_method, memory=hdbscan_memory)
+                    metrics = self.evaluate(labels, probs, X_proc, params, start, precomputed_D2=D2)
                     if getattr(config, 'TOPIC_CLUSTERING_DEBUG', False):
                         print(f"[topic-cluster] iter={it} method={selection_method} mcs={params['min_cluster_size']} ms={params['min_samples']} clusters={metrics.cluster_count} noise={metrics.noise_ratio:.3f}")
                     # Track best: prefer more clusters; tie-break lower noise
@@ -500,9 +764,14 @@ class TopicClusteringService:
                             selection_method = 'eom'
                             continue
                         break
-                    # Adapt parameters for next iteration
+                    # Adapt min_cluster_size only; min_samples stays pinned so the
+                    # cached MST remains valid across iterations
                     params['min_cluster_size'] = max(floor_, int(params['min_cluster_size'] * 0.75))
-                    params['min_samples'] = max(3, int(params['min_cluster_size'] * 0.35))
+                try:
+                    import shutil
+                    shutil.rmtree(hdbscan_cache_dir, ignore_errors=True)
+                except Exception:
+                    pass
                 # Use best found
                 metrics, labels, probs, params, selection_method = best_state  # type: ignore
                 metrics.warnings.append(f"final_selection_method={selection_method}")
@@ -522,22 +791,6 @@ class TopicClusteringService:
                         import traceback
                         traceback.print_exc()
                 raise e
-            # Propagate labels back into structure for snapshot
-            # We create a temp mapping used for snapshot assembly with proper labels/keywords
-            for cid, data in labeled_clusters.items():
-                pass  # data mutated in place
-            snapshot = self.build_snapshot(ids, labels, probs, metrics, params, pca_info)
-            # Replace cluster entries with updated labels / keywords
-            label_map = {cid: data for cid, data in labeled_clusters.items()}
-            for entry in snapshot['clusters']:
-                cid = entry['id']
-                if cid in label_map:
-                    entry['label'] = label_map[cid].get('label', entry['label'])
-                    entry['top_keywords'] = label_map[cid].get('top_keywords', entry['top_keywords'])
-                    entry['exemplar_video_id'] = label_map[cid].get('exemplar', entry['exemplar_video_id'])
-                    entry['mean_probability'] = label_map[cid].get('mean_probability', entry['mean_probability'])
-            self.save_snapshot_atomic(snapshot)
-            return snapshot
 
     def get_topics(self, sort: str = 'size_desc', include_noise: bool = False, limit: Optional[int] = None, offset: int = 0) -> Dict[str, Any]:
         snap = self.load_snapshot()
@@ -545,19 +798,23 @@ class TopicClusteringService:
             return {'clusters': [], 'count': 0, 'total_videos': 0}
         clusters = snap.get('clusters', [])
         if not include_noise:
-            assignments = snap.get('assignments', {})
-            noise_ids = {vid for vid, lbl in assignments.items() if lbl == -1}
-            # Filter out clusters referencing noise id; noise cluster not explicitly stored; nothing to remove.
+            # Noise is not stored as an explicit cluster entry; nothing to remove.
             # (If later we add an explicit noise entry, we'd filter here.)
             pass
-        if sort == 'size_asc':
-            clusters.sort(key=lambda c: c.get('size', 0))
-        elif sort == 'alpha':
-            clusters.sort(key=lambda c: (c.get('label') or '').lower())
-        elif sort == 'alpha_desc':
-            clusters.sort(key=lambda c: (c.get('label') or '').lower(), reverse=True)
-        else:
-            clusters.sort(key=lambda c: c.get('size', 0), reverse=True)
+        # Memoize sorted views per sort mode; sorting in place here would also
+        # mutate snap['clusters'] and leak the last ordering into other calls
+        view = self._sorted_views.get(sort)
+        if view is None:
+            if sort == 'size_asc':
+                view = sorted(clusters, key=lambda c: c.get('size', 0))
+            elif sort == 'alpha':
+                view = sorted(clusters, key=lambda c: (c.get('label') or '').lower())
+            elif sort == 'alpha_desc':
+                view = sorted(clusters, key=lambda c: (c.get('label') or '').lower(), reverse=True)
+            else:
+                view = sorted(clusters, key=lambda c: c.get('size', 0), reverse=True)
+            self._sorted_views[sort] = view
+        clusters = view
         total = len(clusters)
         if offset:
             clusters = clusters[offset:]
@@ -577,8 +834,7 @@ class TopicClusteringService:
         snap = self.load_snapshot()
         if not snap:
             return {'error': 'no snapshot'}
-        assignments = snap.get('assignments', {})
-        member_ids = [vid for vid, lbl in assignments.items() if lbl == cluster_id]
+        member_ids = self._cluster_index(snap).get(cluster_id, [])
         # Pull metadata for members
         items = self.vectordb.get_items(member_ids)
         videos: List[Dict[str, Any]] = []
@@ -591,7 +847,7 @@ class TopicClusteringService:
                 'id': vid,
                 'title': meta.get('title'),
                 'channel': meta.get('channel'),
-                'url': meta.get('url'),
+                'url': meta.get('url') or f"https://www.youtube.com/watch?v={vid}",
                 'published_at': meta.get('publishedAt'),
                 'duration_seconds': meta.get('duration_seconds'),
                 'thumbnail': f"https://img.youtube.com/vi/{vid}/hqdefault.jpg"
@@ -1,32 +1,187 @@
 # src/services/vectordb_service.py
+import asyncio
+import hashlib
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
 import chromadb
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 from src import config
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
+
+_BATCH_SIZE = config.CHROMA_BATCH_SIZE  # resolved once at import; hot loops use this
+
+
+class MetaRow:
+    """Lightweight read-only view of one collection record's metadata.
+
+    Full-collection scans allocate one of these per record instead of a
+    fresh dict (~230-byte header each on CPython); the common fields are
+    slot attributes and `data` references the batch's metadata dict
+    without copying it.
+    """
+    __slots__ = ("id", "title", "channel", "url", "data")
+
+    def __init__(self, id: Optional[str], data: dict):
+        self.id = id
+        self.data = data
+        self.title = data.get('title')
+        self.channel = data.get('channel')
+        # Older records persisted a url; newer ones derive it from the id
+        url = data.get('url')
+        self.url = url if url else (f"https://www.youtube.com/watch?v={id}" if id else None)
+
+    def get(self, key: str, default=None):
+        """Dict-style access covering both slot fields and raw metadata."""
+        if key == 'id':
+            return self.id if self.id is not None else default
+        return self.data.get(key, default)
+
 
 class VectorDBService:
     """A service class for interacting with a ChromaDB vector database."""
 
-    def __init__(self, path: str, collection_name: str):
+    def __init__(self, path: str, collection_name: str, quantize: str | None = None):
+        # quantize='int8' stores scalar-quantized vectors (per-vector scale kept
+        # in metadata). Cosine distance is scale-invariant, so ranking only sees
+        # the small rounding noise while the payload shrinks ~4x.
+        self.quantize = quantize if quantize is not None else getattr(config, 'CHROMA_QUANTIZE', 'none')
+        # With 'ip' space we pre-normalize vectors ourselves, making each HNSW
+        # distance a bare dot product instead of cosine's extra norm passes
+        self._space = getattr(config, 'HNSW_SPACE', 'cosine')
+        if self.quantize == 'int8' and self._space == 'ip':
+            # int8's per-vector scale (max|v|/127) leaves stored norms varying
+            # across rows, so raw inner products would rank by 1/scale rather
+            # than similarity. Quantization is only sound in a scale-invariant
+            # space; create new collections as cosine instead. (Existing
+            # collections keep their physical space — re-checked below.)
+            print("Warning: int8 quantization is incompatible with 'ip' space; using 'cosine'.")
+            self._space = 'cosine'
+        # Short-TTL count() memo; writes invalidate it explicitly
+        self._count_cache: Optional[tuple[float, int]] = None
         print(f"Initializing ChromaDB client at: {path}")
         try:
             self.client = chromadb.PersistentClient(path=path)
             print(f"Getting or creating ChromaDB collection: '{collection_name}'")
             self.collection = self.client.get_or_create_collection(
                 name=collection_name,
-                metadata={"hnsw:space": "cosine"} 
+                metadata={
+                    "hnsw:space": self._space,
+                    "hnsw:M": config.HNSW_M,
+                    "hnsw:construction_ef": config.HNSW_EF_CONSTRUCTION,
+                    "hnsw:search_ef": config.HNSW_SEARCH_EF,
+                    "hnsw:num_threads": os.cpu_count() or 4,
+                }
             )
+            # hnsw:space is fixed at creation and get_or_create_collection
+            # ignores metadata for existing collections, so the configured
+            # value may not be what the index physically uses. Normalization
+            # and the int8 guard must track the collection, not the config.
+            actual_space = (getattr(self.collection, 'metadata', None) or {}).get('hnsw:space')
+            if actual_space and actual_space != self._space:
+                print(f"Note: collection '{collection_name}' uses hnsw:space='{actual_space}' "
+                      f"(configured '{self._space}'); following the collection.")
+                self._space = actual_space
+            if self.quantize == 'int8' and self._space == 'ip':
+                # The existing index is physically ip; storing scaled int8
+                # vectors in it would corrupt ranking, so refuse the knob
+                print("Warning: int8 quantization disabled — this collection's 'ip' space "
+                      "is not scale-invariant.")
+                self.quantize = 'none'
             print(f"Collection '{collection_name}' ready. Item count: {self.count()}")
         except Exception as e:
             print(f"Fatal Error initializing ChromaDB: {e}")
             raise
+        # LRU cache for query(); keys quantize the embedding to fp16 so
+        # near-identical query vectors hit, and each entry keeps the
+        # normalized query vector for semantic (cosine >= threshold) hits.
+        # Writes bump the generation, which is part of the key, so stale
+        # entries simply age out. The lock covers every read and mutation:
+        # concurrent request threads share this cache.
+        self._query_cache: "OrderedDict[tuple, tuple[np.ndarray, Dict[str, Any]]]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self._query_cache_generation = 0
+        # Lazy channel -> video records index; one metadata pass to build,
+        # then O(1) channel browsing. Writes invalidate it.
+        self._channel_index: Optional[dict[str, list[dict]]] = None
+        # LRU of recently fetched items (get_items); re-enrichment sweeps hit
+        # the same hot id set repeatedly. Writes evict affected entries.
+        self._items_cache: "OrderedDict[str, dict]" = OrderedDict()
+        self._items_cache_lock = threading.Lock()
+
+    def _sqlite_connection(self):
+        """Best-effort handle to the PersistentClient's underlying SQLite connection.
+
+        Reaches into private client internals, so every access is guarded;
+        returns None when the client layout doesn't match (e.g. HTTP client
+        or a Chroma version that moved things around).
+        """
+        try:
+            server = getattr(self.client, '_server', None) or self.client
+            sysdb = getattr(server, '_sysdb', None)
+            pool = getattr(sysdb, '_conn_pool', None)
+            if pool is not None:
+                return pool.connect()
+        except Exception as e:
+            print(f"Warning: could not reach underlying SQLite connection: {e}")
+        return None
+
+    @contextmanager
+    def bulk_ingest_mode(self):
+        """Temporarily relax SQLite durability PRAGMAs for large upserts.
+
+        Disabling the journal and synchronous writes removes most per-transaction
+        fsync overhead during bulk ingest. UNSAFE: a crash while this is active
+        can corrupt the database — use only for rebuilds that can be re-run
+        from scratch. Restores Chroma's defaults (WAL/normal) on exit.
+        """
+        conn = self._sqlite_connection()
+        if conn is None:
+            # No reachable SQLite handle; run the block with normal durability
+            yield self
+            return
+        applied = False
+        try:
+            conn.execute("pragma journal_mode=off")
+            conn.execute("pragma synchronous=off")
+            conn.execute("pragma temp_store=memory")
+            conn.execute("pragma locking_mode=exclusive")
+            applied = True
+            print("Bulk ingest mode: SQLite durability PRAGMAs relaxed (unsafe until exit).")
+        except Exception as e:
+            print(f"Warning: failed to apply bulk ingest PRAGMAs: {e}")
+        try:
+            yield self
+        finally:
+            if applied:
+                try:
+                    conn.execute("pragma journal_mode=wal")
+                    conn.execute("pragma synchronous=normal")
+                    conn.execute("pragma temp_store=default")
+                    conn.execute("pragma locking_mode=normal")
+                    print("Bulk ingest mode: SQLite durability PRAGMAs restored.")
+                except Exception as e:
+                    print(f"Warning: failed to restore SQLite PRAGMAs: {e}")
+
+    @staticmethod
+    def _quantize_int8(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Scalar-quantize rows to int8, returning (quantized, per-row scales)."""
+        scales = np.abs(matrix).max(axis=1, keepdims=True) / 127.0
+        np.maximum(scales, 1e-12, out=scales)
+        return np.rint(matrix / scales).astype(np.int8), scales
 
-    def upsert_documents(self, embeddings: List[list], ids: List[str], metadatas: List[dict], documents: List[str]) -> tuple[int, int]:
+    def upsert_documents(self, embeddings: "np.ndarray | List[list]", ids: List[str], metadatas: List[dict], documents: List[str]) -> tuple[int, int]:
         """
         Upserts (inserts or updates) documents into the ChromaDB collection.
 
         Args:
-            embeddings (List[list]): List of embedding vectors.
+            embeddings: Embedding vectors as an (N, D) numpy array or list of lists.
             ids (List[str]): List of corresponding document IDs.
             metadatas (List[dict]): List of corresponding metadata dictionaries.
             documents (List[str]): List of corresponding source text documents.
@@ -41,31 +196,187 @@ class VectorDBService:
             return 0, 0
 
         if not (len(embeddings) == len(ids) == len(metadatas) == len(documents)):
-            print("Error: Mismatch in list lengths for ChromaDB storage. Aborting.")
-            return 0, len(ids)
+            # A length mismatch is a caller bug; fail fast rather than report
+            # a partial-failure tuple the caller may silently ignore
+            raise ValueError(
+                f"Mismatched lengths for ChromaDB storage: embeddings={len(embeddings)}, "
+                f"ids={len(ids)}, metadatas={len(metadatas)}, documents={len(documents)}"
+            )
 
-        added_count, skipped_count = 0, 0
-        for i in tqdm(range(0, len(ids), config.CHROMA_BATCH_SIZE), desc="ChromaDB Batches"):
-            batch_end = min(i + config.CHROMA_BATCH_SIZE, len(ids))
+        # Hold embeddings as one contiguous float32 matrix (7x smaller than
+        # boxed Python floats); convert to lists only at the Chroma boundary
+        try:
+            emb_matrix: Optional[np.ndarray] = np.ascontiguousarray(embeddings, dtype=np.float32)
+        except Exception:
+            emb_matrix = None  # ragged input; fall back to plain list slicing
+
+        if self._space == 'ip' and emb_matrix is not None:
+            norms = np.linalg.norm(emb_matrix, axis=1, keepdims=True)
+            np.maximum(norms, 1e-12, out=norms)
+            emb_matrix /= norms
+
+        if self.quantize == 'int8' and emb_matrix is not None:
+            emb_matrix, scales = self._quantize_int8(emb_matrix)
+            metadatas = [dict(m, q_scale=float(s)) for m, s in zip(metadatas, scales[:, 0])]
+
+        # Stamp each record with its content hash and skip rows whose stored
+        # hash already matches — re-writing identical vectors is pure waste
+        doc_hashes = [hashlib.sha256((d or '').encode('utf-8')).hexdigest() for d in documents]
+        metadatas = [dict(m, content_hash=h) for m, h in zip(metadatas, doc_hashes)]
+        hash_by_id = dict(zip(ids, doc_hashes))
+        unchanged: set = set()
+        try:
+            for i in range(0, len(ids), _BATCH_SIZE):
+                existing = self.collection.get(ids=ids[i:i+_BATCH_SIZE], include=['metadatas'])
+                got = existing.get('ids') or []
+                mets = existing.get('metadatas') or []
+                for j, vid in enumerate(got):
+                    meta = mets[j] if j < len(mets) and isinstance(mets[j], dict) else {}
+                    if meta.get('content_hash') and meta.get('content_hash') == hash_by_id.get(vid):
+                        unchanged.add(vid)
+        except Exception as e:
+            print(f"Warning: content-hash pre-check failed; upserting all rows: {e}")
+            unchanged = set()
+        if unchanged:
+            keep = [i for i, vid in enumerate(ids) if vid not in unchanged]
+            print(f"Skipping {len(ids) - len(keep)} unchanged documents (content hash match).")
+            if not keep:
+                print("Finished upserting to ChromaDB. Added/Updated: 0, Skipped: 0")
+                return 0, 0
+            ids = [ids[i] for i in keep]
+            metadatas = [metadatas[i] for i in keep]
+            documents = [documents[i] for i in keep]
+            if emb_matrix is not None:
+                emb_matrix = emb_matrix[keep]
+            else:
+                embeddings = [embeddings[i] for i in keep]
+
+        # For large batches, insert in projection order rather than caller
+        # (temporal) order: neighboring inserts share HNSW entry points and
+        # touch the same graph pages, cutting construction churn. A 1-D
+        # projection onto the sample's leading principal direction is enough.
+        if emb_matrix is not None and len(ids) > _BATCH_SIZE * 4:
             try:
-                self.collection.upsert(
-                    ids=ids[i:batch_end],
-                    embeddings=embeddings[i:batch_end],
-                    metadatas=metadatas[i:batch_end],
-                    documents=documents[i:batch_end]
-                )
-                added_count += len(ids[i:batch_end])
+                sample = emb_matrix[:1024].astype(np.float32)
+                _, _, vt = np.linalg.svd(sample - sample.mean(axis=0), full_matrices=False)
+                order = np.argsort(emb_matrix.astype(np.float32) @ vt[0])
+                ids = [ids[i] for i in order]
+                metadatas = [metadatas[i] for i in order]
+                documents = [documents[i] for i in order]
+                emb_matrix = emb_matrix[order]
             except Exception as e:
-                print(f"\nError adding batch to ChromaDB: {e}")
-                skipped_count += len(ids[i:batch_end])
-        
+                print(f"Warning: skipping locality-ordered insert: {e}")
+
+        added_count, skipped_count = 0, 0
+        # Chunk ids/metadatas/documents in a single linear islice pass rather
+        # than four fresh list slices per batch; embedding rows stay as matrix
+        # slices (C-level) resolved per chunk by offset.
+        record_iter = iter(zip(ids, metadatas, documents))
+        chunks: List[tuple] = []
+        start = 0
+        while True:
+            chunk = list(itertools.islice(record_iter, _BATCH_SIZE))
+            if not chunk:
+                break
+            ids_b, md_b, doc_b = map(list, zip(*chunk))
+            chunks.append((start, ids_b, md_b, doc_b))
+            start += len(chunk)
+
+        _upsert = self.collection.upsert  # bound once; skips two lookups per batch
+
+        def _upsert_chunk(start: int, ids_b: List[str], md_b: List[dict], doc_b: List[str]) -> int:
+            end = start + len(ids_b)
+            # Hand Chroma the ndarray slice directly — the client consumes
+            # numpy rows natively, so no boxing of 100x768 Python floats
+            _upsert(
+                ids=ids_b,
+                embeddings=emb_matrix[start:end] if emb_matrix is not None else embeddings[start:end],
+                metadatas=md_b,
+                documents=doc_b
+            )
+            return len(ids_b)
+
+        # Each upsert is I/O-bound on a Chroma/SQLite transaction, so issue
+        # batches through a small thread pool (single shared collection handle)
+        workers = max(1, getattr(config, 'CHROMA_UPSERT_WORKERS', 4))
+        with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            futures = {executor.submit(_upsert_chunk, *chunk): chunk for chunk in chunks}
+            for fut in tqdm(as_completed(futures), total=len(futures), desc="ChromaDB Batches"):
+                try:
+                    added_count += fut.result()
+                except Exception as e:
+                    print(f"\nError adding batch to ChromaDB: {e}")
+                    skipped_count += len(futures[fut][1])
+
+        with self._query_cache_lock:
+            self._query_cache_generation += 1  # invalidate cached query results
+        self._count_cache = None
+        self._channel_index = None
+        self._invalidate_items(ids)
         print(f"Finished upserting to ChromaDB. Added/Updated: {added_count}, Skipped: {skipped_count}")
         return added_count, skipped_count
 
+    async def aupsert_documents(self, embeddings: "np.ndarray | List[list]", ids: List[str], metadatas: List[dict], documents: List[str]) -> tuple[int, int]:
+        """Async-friendly upsert for coroutine-based ingest paths.
+
+        The local PersistentClient is synchronous, so the (already
+        thread-pooled) upsert_documents runs in a worker thread to keep the
+        caller's event loop responsive.
+        """
+        return await asyncio.to_thread(self.upsert_documents, embeddings, ids, metadatas, documents)
+
     def query(self, query_embedding: List[float], n_results: int) -> Optional[Dict[str, Any]]:
         """Performs a similarity search against the collection."""
+        if self._space == 'ip':
+            try:
+                q = np.asarray(query_embedding, dtype=np.float32)
+                norm = float(np.linalg.norm(q))
+                if norm > 1e-12:
+                    query_embedding = (q / norm).tolist()
+            except Exception as e:
+                print(f"Warning: failed to normalize query embedding: {e}")
+        if self.quantize == 'int8':
+            try:
+                q, _ = self._quantize_int8(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))
+                query_embedding = q[0].astype(np.float32).tolist()
+            except Exception as e:
+                print(f"Warning: failed to quantize query embedding: {e}")
         try:
-            return self.collection.query(
+            key = (np.asarray(query_embedding, dtype=np.float16).tobytes(),
+                   n_results, self._query_cache_generation)
+        except Exception:
+            key = None
+        query_vec: Optional[np.ndarray] = None
+        try:
+            qv = np.asarray(query_embedding, dtype=np.float32)
+            qn = float(np.linalg.norm(qv))
+            if qn > 1e-12:
+                query_vec = qv / qn
+        except Exception:
+            query_vec = None
+        if key is not None:
+            with self._query_cache_lock:
+                cached = self._query_cache.get(key)
+                if cached is not None:
+                    self._query_cache.move_to_end(key)
+                    return cached[1]
+                # Semantic hit: paraphrased queries embed nearly identically, so
+                # serve any cached result whose query vector is close enough.
+                # Scanning a few hundred cached vectors is one small matmul.
+                if query_vec is not None and self._query_cache:
+                    threshold = getattr(config, 'QUERY_CACHE_SIMILARITY', 0.98)
+                    candidates = [(k, v) for k, v in self._query_cache.items()
+                                  if k[1] == n_results and k[2] == self._query_cache_generation
+                                  and v[0] is not None and v[0].shape == query_vec.shape]
+                    if candidates:
+                        sims = np.stack([v[0] for _, v in candidates]) @ query_vec
+                        best = int(np.argmax(sims))
+                        if sims[best] >= threshold:
+                            best_key = candidates[best][0]
+                            self._query_cache.move_to_end(best_key)
+                            return candidates[best][1][1]
+        try:
+            result = self.collection.query(
                 query_embeddings=[query_embedding],
                 n_results=n_results,
                 include=['metadatas', 'distances', 'documents']
@@ -73,6 +384,31 @@ class VectorDBService:
         except Exception as e:
             print(f"Error querying ChromaDB: {e}")
             return None
+        if key is not None and result is not None:
+            with self._query_cache_lock:
+                self._query_cache[key] = (query_vec, result)
+                while len(self._query_cache) > getattr(config, 'QUERY_CACHE_SIZE', 1024):
+                    self._query_cache.popitem(last=False)
+        return result
+
+    def query_batch(self, query_embeddings: List[List[float]], n_results: int) -> Optional[Dict[str, Any]]:
+        """Runs several similarity searches in one Chroma call.
+
+        Passing all query vectors at once amortizes the per-call overhead and
+        lets Chroma parallelize the HNSW traversals internally; prefer this
+        over calling query() in a loop.
+        """
+        if not query_embeddings:
+            return None
+        try:
+            return self.collection.query(
+                query_embeddings=query_embeddings,
+                n_results=n_results,
+                include=['metadatas', 'distances', 'documents']
+            )
+        except Exception as e:
+            print(f"Error batch-querying ChromaDB: {e}")
+            return None
 
     def delete(self, ids: List[str]):
         """Deletes documents from the collection by their IDs."""
@@ -80,75 +416,165 @@ class VectorDBService:
             return
         try:
             self.collection.delete(ids=ids)
+            with self._query_cache_lock:
+                self._query_cache_generation += 1  # invalidate cached query results
+            self._count_cache = None
+            self._channel_index = None
+            self._invalidate_items(ids)
             print(f"Deleted {len(ids)} items from ChromaDB.")
         except Exception as e:
             print(f"Error deleting items from ChromaDB: {e}")
 
-    def get_all_ids(self) -> List[str]:
-        """Retrieves all document IDs from the collection."""
+    def get_all_ids(self, page_size: int = 10000) -> List[str]:
+        """Retrieves all document IDs from the collection.
+
+        Pages in fixed-size chunks instead of one unbounded get, which on
+        large collections materializes every id in a single response and
+        spikes peak memory.
+        """
+        result: List[str] = []
+        offset = 0
         try:
-            return self.collection.get(include=[])['ids']
+            while True:
+                page = self.collection.get(include=[], limit=page_size, offset=offset).get('ids') or []
+                if not page:
+                    break
+                result.extend(page)
+                offset += len(page)
         except Exception as e:
             print(f"Error getting all IDs from ChromaDB: {e}")
-            return []
+        return result
 
     def count(self) -> int:
-        """Returns the total number of items in the collection."""
+        """Returns the total number of items in the collection.
+
+        Memoized for a short window so polling callers (cache-staleness
+        checks, loop guards) don't each pay a Chroma round-trip; writes
+        through this service invalidate the memo immediately.
+        """
+        cached = self._count_cache
+        if cached is not None and time.monotonic() - cached[0] < 0.5:
+            return cached[1]
         try:
-            return self.collection.count()
+            value = self.collection.count()
         except Exception as e:
             print(f"Error counting items in ChromaDB: {e}")
             return 0
+        self._count_cache = (time.monotonic(), value)
+        return value
 
-    def get_all_metadatas(self, batch_size: int = 1000, include_ids: bool = True) -> list[dict]:
-        """Retrieve all metadatas (and optionally IDs) from the collection.
+    def iter_metadatas(self, batch_size: int = 1000, include_ids: bool = True) -> Iterator[dict]:
+        """Lazily yield metadatas (and optionally IDs) from the collection.
 
-        Chroma's collection.get may limit results; this performs batched retrieval.
+        Streams batched collection.get results one record at a time so callers
+        that iterate once never materialize the whole collection.
 
         Args:
             batch_size: Number of records to pull per batch.
             include_ids: If True, include the id in each metadata dict under key 'id'.
 
-        Returns:
-            List of metadata dictionaries.
+        Yields:
+            Metadata dictionaries (copies when include_ids, otherwise the
+            original batch references).
         """
-        metadatas: list[dict] = []
         try:
-            total = self.count()
-            if total == 0:
-                return metadatas
+            # No upfront count() round-trip; the empty-batch check below is
+            # the loop terminator and stays correct under concurrent writes
             offset = 0
-            while offset < total:
+            while True:
                 try:
                     batch = self.collection.get(
                         include=["metadatas"],
                         offset=offset,
-                        limit=min(batch_size, total - offset)
+                        limit=batch_size
                     )
-                    batch_metas = batch.get('metadatas', [])
-                    if batch_metas is None:
-                        batch_metas = []
-                    if include_ids:
-                        batch_ids = batch.get('ids', [])
-                        if batch_ids is None:
-                            batch_ids = []
-                        for i, m in enumerate(batch_metas):
-                            if isinstance(m, dict):
-                                m = m.copy()
-                                if i < len(batch_ids):
-                                    m['id'] = batch_ids[i]
-                                metadatas.append(m)
-                    else:
-                        metadatas.extend([m for m in batch_metas if isinstance(m, dict)])
-                    if not batch_metas:
-                        break  # defensive break to avoid infinite loop
-                    offset += len(batch_metas)
                 except Exception as inner_e:
                     print(f"Warning: Failed to retrieve metadatas batch at offset {offset}: {inner_e}")
-                    break
+                    return
+                batch_metas = batch.get('metadatas', [])
+                if batch_metas is None:
+                    batch_metas = []
+                if not batch_metas:
+                    return  # defensive stop to avoid infinite loop
+                batch_ids = batch.get('ids', []) if include_ids else []
+                if batch_ids is None:
+                    batch_ids = []
+                # Schema is uniform within a batch: decide the merge shape once
+                # rather than copy-then-assign per record
+                merge_ids = (include_ids and len(batch_ids) >= len(batch_metas)
+                             and not (isinstance(batch_metas[0], dict) and 'id' in batch_metas[0]))
+                for i, m in enumerate(batch_metas):
+                    if not isinstance(m, dict):
+                        continue
+                    yield {**m, 'id': batch_ids[i]} if merge_ids else m
+                offset += len(batch_metas)
         except Exception as e:
             print(f"Error retrieving all metadatas: {e}")
-        return metadatas
+
+    def iter_meta_rows(self, batch_size: int = 1000) -> Iterator[MetaRow]:
+        """Lazily yield MetaRow views over every record's metadata.
+
+        Prefer this over iter_metadatas for read-only scans: no per-record
+        dict copy or merge, just a slotted wrapper around the batch data.
+        """
+        try:
+            offset = 0
+            while True:
+                try:
+                    batch = self.collection.get(
+                        include=["metadatas"],
+                        offset=offset,
+                        limit=batch_size
+                    )
+                except Exception as inner_e:
+                    print(f"Warning: Failed to retrieve metadatas batch at offset {offset}: {inner_e}")
+                    return
+                batch_metas = batch.get('metadatas') or []
+                if not batch_metas:
+                    return
+                batch_ids = batch.get('ids') or []
+                for i, m in enumerate(batch_metas):
+                    if not isinstance(m, dict):
+                        continue
+                    yield MetaRow(batch_ids[i] if i < len(batch_ids) else None, m)
+                offset += len(batch_metas)
+        except Exception as e:
+            print(f"Error retrieving metadata rows: {e}")
+
+    def get_all_metadatas(self, batch_size: int = 1000, include_ids: bool = True) -> list[dict]:
+        """Retrieve all metadatas (and optionally IDs) as a list.
+
+        Prefer iter_metadatas when a single pass suffices; this materializes
+        every record. Fetches the (cheap) id list first and then id-targeted
+        batches in parallel: offset/limit paging is an ordered scan whose
+        per-page cost grows with the offset, while id-targeted gets are hash
+        lookups and safe to overlap.
+        """
+        all_ids = self.get_all_ids()
+        if not all_ids:
+            return []
+        subsets = [all_ids[i:i + batch_size] for i in range(0, len(all_ids), batch_size)]
+        results: list = [None] * len(subsets)
+
+        def _fetch(idx: int, subset: List[str]) -> None:
+            batch = self.collection.get(ids=subset, include=['metadatas'])
+            got_ids = batch.get('ids') or []
+            metas = batch.get('metadatas') or []
+            if include_ids and len(got_ids) >= len(metas):
+                results[idx] = [{**m, 'id': got_ids[i]} for i, m in enumerate(metas) if isinstance(m, dict)]
+            else:
+                results[idx] = [m for m in metas if isinstance(m, dict)]
+
+        workers = max(1, getattr(config, 'CHROMA_READ_WORKERS', 8))
+        with ThreadPoolExecutor(max_workers=min(workers, len(subsets))) as executor:
+            futures = {executor.submit(_fetch, i, s): i for i, s in enumerate(subsets)}
+            for fut in as_completed(futures):
+                try:
+                    fut.result()
+                except Exception as e:
+                    print(f"Warning: failed to retrieve metadata batch {futures[fut]}: {e}")
+                    results[futures[fut]] = []
+        return [rec for chunk in results if chunk for rec in chunk]
 
     def get_videos_by_channel(self, channel: str, limit: int = 500) -> list[dict]:
         """Return a list of video metadata dicts for a specific channel.
@@ -161,11 +587,49 @@ class VectorDBService:
         """
         if not channel:
             return []
+        # Serve from the lazy channel index: Chroma's where-filter does a
+        # linear metadata scan per request, so one indexing pass amortizes
+        # every subsequent channel-browse click to a dict lookup. Records
+        # carry their document text so index hits match the filter path.
+        try:
+            if self._channel_index is None:
+                index: dict[str, list[dict]] = {}
+                offset = 0
+                while True:
+                    batch = self.collection.get(
+                        include=['metadatas', 'documents'],
+                        offset=offset,
+                        limit=1000
+                    )
+                    metas = batch.get('metadatas') or []
+                    if not metas:
+                        break
+                    batch_ids = batch.get('ids') or []
+                    docs = batch.get('documents') or []
+                    have_ids = len(batch_ids) >= len(metas)
+                    have_docs = len(docs) >= len(metas)
+                    for i, m in enumerate(metas):
+                        if not isinstance(m, dict):
+                            continue
+                        ch = m.get('channel')
+                        if not ch:
+                            continue
+                        record = dict(m)
+                        if have_ids:
+                            record['id'] = batch_ids[i]
+                        if have_docs:
+                            record['document'] = docs[i]
+                        index.setdefault(ch, []).append(record)
+                    offset += len(metas)
+                self._channel_index = index
+            return self._channel_index.get(channel, [])[:limit]
+        except Exception as e:
+            print(f"Warning: channel index unavailable ({e}); using where filter.")
         try:
-            # Attempt simple where filter; if unsupported, fallback to manual filter
+            # 'ids' is not a valid include key — Chroma returns ids regardless
             raw = self.collection.get(
                 where={'channel': channel},
-                include=['metadatas', 'ids', 'documents'],
+                include=['metadatas', 'documents'],
                 limit=limit
             )
             metadatas = raw.get('metadatas', [])
@@ -177,27 +641,24 @@ class VectorDBService:
             docs = raw.get('documents', [])
             if docs is None:
                 docs = []
+            # Uniform schema per response: build each record in a single dict
+            # merge instead of copy + per-key assignment
+            have_ids = len(ids) >= len(metadatas)
+            have_docs = len(docs) >= len(metadatas)
             videos = []
             for i, m in enumerate(metadatas):
                 if not isinstance(m, dict):
                     continue
-                vid = m.copy()
-                if i < len(ids):
-                    vid['id'] = ids[i]
-                if i < len(docs):
-                    vid['document'] = docs[i]
-                videos.append(vid)
+                if have_ids and have_docs:
+                    videos.append({**m, 'id': ids[i], 'document': docs[i]})
+                elif have_ids:
+                    videos.append({**m, 'id': ids[i]})
+                else:
+                    videos.append(dict(m))
             return videos
         except Exception as e:
-            print(f"Warning: direct channel query failed ({e}); falling back to full scan.")
-            # Fallback full scan limited by limit
-            result = []
-            for m in self.get_all_metadatas():
-                if m.get('channel') == channel:
-                    result.append(m)
-                    if len(result) >= limit:
-                        break
-            return result
+            print(f"Error: channel query failed: {e}")
+            return []
 
     # --- Enrichment / Maintenance Helpers ---
     def get_items(self, ids: List[str]) -> dict[str, dict]:
@@ -210,77 +671,84 @@ class VectorDBService:
         if not ids:
             return {}
         out: dict[str, dict] = {}
-        try:
-            batch_size = getattr(config, 'CHROMA_BATCH_SIZE', 100) if 'config' in globals() else 100
-        except Exception:
-            batch_size = 100
-        for i in range(0, len(ids), batch_size):
-            subset = ids[i:i+batch_size]
-            try:
-                batch = self.collection.get(ids=subset, include=['embeddings', 'metadatas', 'documents'])
-                got_ids = batch.get('ids', [])
-                if got_ids is None:
-                    got_ids = []
-                mets = batch.get('metadatas', [])
-                if mets is None:
-                    mets = []
-                embs = batch.get('embeddings', [])
-                if embs is None:
-                    embs = []
-                docs = batch.get('documents', [])
-                if docs is None:
-                    docs = []
-                for j, vid in enumerate(got_ids):
-                    out[vid] = {
-                        'embedding': embs[j] if j < len(embs) else None,
-                        'metadata': mets[j] if j < len(mets) else {},
-                        'document': docs[j] if j < len(docs) else ''
-                    }
-            except Exception as e:
-                print(f"Warning: failed to retrieve batch of items ({len(subset)} ids) - {e}")
+        misses: List[str] = []
+        with self._items_cache_lock:
+            for vid in ids:
+                item = self._items_cache.get(vid)
+                if item is not None:
+                    self._items_cache.move_to_end(vid)
+                    out[vid] = item
+                else:
+                    misses.append(vid)
+        if not misses:
+            return out
+        batch_size = _BATCH_SIZE
+        subsets = [misses[i:i+batch_size] for i in range(0, len(misses), batch_size)]
+
+        def _fetch_subset(subset: List[str]) -> None:
+            batch = self.collection.get(ids=subset, include=['embeddings', 'metadatas', 'documents'])
+            got_ids = batch.get('ids', [])
+            if got_ids is None:
+                got_ids = []
+            mets = batch.get('metadatas', [])
+            if mets is None:
+                mets = []
+            embs = batch.get('embeddings', [])
+            if embs is None:
+                embs = []
+            docs = batch.get('documents', [])
+            if docs is None:
+                docs = []
+            for j, vid in enumerate(got_ids):
+                # per-key dict assignment; safe across threads under the GIL
+                out[vid] = {
+                    'embedding': embs[j] if j < len(embs) else None,
+                    'metadata': mets[j] if j < len(mets) else {},
+                    'document': docs[j] if j < len(docs) else ''
+                }
+
+        # Batched reads are latency-bound on Chroma/SQLite; overlap them
+        workers = max(1, getattr(config, 'CHROMA_READ_WORKERS', min(8, os.cpu_count() or 1)))
+        with ThreadPoolExecutor(max_workers=min(workers, len(subsets))) as executor:
+            futures = {executor.submit(_fetch_subset, subset): subset for subset in subsets}
+            for fut in as_completed(futures):
+                try:
+                    fut.result()
+                except Exception as e:
+                    print(f"Warning: failed to retrieve batch of items ({len(futures[fut])} ids) - {e}")
+        capacity = getattr(config, 'CHROMA_ITEMS_CACHE_SIZE', 4096)
+        with self._items_cache_lock:
+            for vid in misses:
+                item = out.get(vid)
+                if item is not None:
+                    self._items_cache[vid] = item
+                    self._items_cache.move_to_end(vid)
+            while len(self._items_cache) > capacity:
+                self._items_cache.popitem(last=False)
         return out
 
+    def _invalidate_items(self, ids) -> None:
+        """Drop cached get_items entries whose backing rows just changed."""
+        if not self._items_cache:
+            return
+        with self._items_cache_lock:
+            for vid in ids:
+                self._items_cache.pop(vid, None)
+
     def update_metadatas(self, updates: dict[str, dict]) -> tuple[int, int]:
         """Merge and update metadata for existing IDs.
 
+        Metadata-only, so this delegates to patch_metadatas: the partial
+        collection.update API preserves stored embeddings and documents,
+        making the old get_items round-trip (which fetched embeddings just
+        to write them back) unnecessary.
+
         Args:
             updates: mapping id -> partial metadata to merge into existing.
         Returns:
             (updated_count, skipped_missing)
         """
-        if not updates:
-            return 0, 0
-        ids = list(updates.keys())
-        existing = self.get_items(ids)
-        to_upsert_ids: list[str] = []
-        to_upsert_embeddings: list[list] = []
-        to_upsert_metadatas: list[dict] = []
-        to_upsert_documents: list[str] = []
-        skipped = 0
-        for vid in ids:
-            item = existing.get(vid)
-            if not item:
-                skipped += 1
-                continue
-            merged_meta = item['metadata'].copy() if isinstance(item['metadata'], dict) else {}
-            patch = updates[vid] or {}
-            merged_meta.update({k: v for k, v in patch.items() if v is not None})
-            to_upsert_ids.append(vid)
-            to_upsert_embeddings.append(item['embedding'])
-            to_upsert_metadatas.append(merged_meta)
-            to_upsert_documents.append(item['document'])
-        if to_upsert_ids:
-            try:
-                self.collection.upsert(
-                    ids=to_upsert_ids,
-                    embeddings=to_upsert_embeddings,
-                    metadatas=to_upsert_metadatas,
-                    documents=to_upsert_documents
-                )
-            except Exception as e:
-                print(f"Error during metadata update upsert: {e}")
-                return 0, len(ids)
-        return len(to_upsert_ids), skipped
+        return self.patch_metadatas(updates)
 
     def bulk_update_metadatas(self, updates: dict[str, dict], batch_size: int | None = None) -> tuple[int, int]:
         """Efficiently apply metadata patches by scanning collection once.
@@ -297,21 +765,26 @@ class VectorDBService:
         """
         if not updates:
             return 0, 0
-        try:
-            if batch_size is None:
-                batch_size = getattr(config, 'CHROMA_BATCH_SIZE', 100)
-        except Exception:
-            batch_size = 100
+        if batch_size is None:
+            batch_size = _BATCH_SIZE
         total = self.count()
         if total == 0:
             return 0, 0
+        self._invalidate_items(updates.keys())
+        # For small update sets the streaming scan is asymptotically wrong:
+        # it deserializes every row in the collection. Fetch by id instead
+        # and keep the scan only for bulk rewrites.
+        if len(updates) / total < 0.2:
+            return self._update_by_ids(updates, batch_size)
         updated = 0
-        skipped_missing = 0
+        seen_ids: set[str] = set()
         offset = 0
         while offset < total:
             try:
+                # Metadata-only operation: fetching embeddings/documents just
+                # to round-trip them through upsert dominates batch cost
                 batch = self.collection.get(
-                    include=['metadatas', 'embeddings', 'documents'],
+                    include=['metadatas'],
                     offset=offset,
                     limit=min(batch_size, total - offset)
                 )
@@ -324,18 +797,11 @@ class VectorDBService:
             mets = batch.get('metadatas', [])
             if mets is None:
                 mets = []
-            embs = batch.get('embeddings', [])
-            if embs is None:
-                embs = []
-            docs = batch.get('documents', [])
-            if docs is None:
-                docs = []
             if not ids:
                 break
+            seen_ids.update(ids)
             to_update_ids = []
-            to_update_embs = []
             to_update_metas = []
-            to_update_docs = []
             for i, vid in enumerate(ids):
                 if vid in updates:
                     base_meta = mets[i] if i < len(mets) and isinstance(mets[i], dict) else {}
@@ -343,23 +809,52 @@ class VectorDBService:
                     merged = base_meta.copy()
                     merged.update({k: v for k, v in patch.items() if v is not None})
                     to_update_ids.append(vid)
-                    to_update_embs.append(embs[i] if i < len(embs) else None)
                     to_update_metas.append(merged)
-                    to_update_docs.append(docs[i] if i < len(docs) else '')
             if to_update_ids:
                 try:
-                    self.collection.upsert(
-                        ids=to_update_ids,
-                        embeddings=to_update_embs,
-                        metadatas=to_update_metas,
-                        documents=to_update_docs
-                    )
+                    self.collection.update(ids=to_update_ids, metadatas=to_update_metas)
                     updated += len(to_update_ids)
                 except Exception as e:
-                    print(f"Error upserting metadata batch (offset {offset}): {e}")
+                    print(f"Error updating metadata batch (offset {offset}): {e}")
             offset += len(ids)
-        # Compute skipped_missing as those update keys never encountered
-        skipped_missing = len([k for k in updates.keys() if k not in self.collection.get(ids=list(updates.keys()), include=[]).get('ids', [])])
+        # The scan already saw every stored id; no second fetch needed
+        skipped_missing = sum(1 for k in updates if k not in seen_ids)
+        return updated, skipped_missing
+
+    def _update_by_ids(self, updates: dict[str, dict], batch_size: int) -> tuple[int, int]:
+        """Targeted-update path: fetch only the ids being patched.
+
+        Reads O(len(updates)) rows instead of streaming the collection,
+        mirroring the batched-get pattern in get_items.
+        """
+        ids_all = list(updates.keys())
+        updated = 0
+        skipped_missing = 0
+        for i in range(0, len(ids_all), batch_size):
+            subset = ids_all[i:i+batch_size]
+            try:
+                batch = self.collection.get(ids=subset, include=['metadatas'])
+            except Exception as e:
+                print(f"Error retrieving update batch ({len(subset)} ids): {e}")
+                skipped_missing += len(subset)
+                continue
+            got_ids = batch.get('ids') or []
+            mets = batch.get('metadatas') or []
+            skipped_missing += len(subset) - len(got_ids)
+            if not got_ids:
+                continue
+            to_update_metas = []
+            for j, vid in enumerate(got_ids):
+                base_meta = mets[j] if j < len(mets) and isinstance(mets[j], dict) else {}
+                patch = updates.get(vid) or {}
+                merged = base_meta.copy()
+                merged.update({k: v for k, v in patch.items() if v is not None})
+                to_update_metas.append(merged)
+            try:
+                self.collection.update(ids=list(got_ids), metadatas=to_update_metas)
+                updated += len(got_ids)
+            except Exception as e:
+                print(f"Error updating targeted metadata batch ({len(got_ids)} ids): {e}")
         return updated, skipped_missing
 
     def patch_metadatas(self, updates: dict[str, dict], batch_size: int | None = None) -> tuple[int, int]:
@@ -370,12 +865,10 @@ class VectorDBService:
         """
         if not updates:
             return 0, 0
-        try:
-            if batch_size is None:
-                batch_size = getattr(config, 'CHROMA_BATCH_SIZE', 100)
-        except Exception:
-            batch_size = 100
+        if batch_size is None:
+            batch_size = _BATCH_SIZE
         ids_all = list(updates.keys())
+        self._invalidate_items(ids_all)
         updated = 0
         skipped_missing = 0
         for i in range(0, len(ids_all), batch_size):
@@ -1,115 +1,592 @@
 # src/services/youtube_service.py
+import asyncio
+import hashlib
+import json
+import os
+import queue
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+from googleapiclient.model import JsonModel
 from tqdm import tqdm
 from src import config
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+try:
+    import aiohttp  # optional: direct REST fan-out with connection reuse
+except ImportError:
+    aiohttp = None
+
+try:
+    from aiolimiter import AsyncLimiter  # optional: leaky-bucket pacing for the async path
+except ImportError:
+    AsyncLimiter = None
+
+# Server-side field filtering: drops localization blobs, thumbnails,
+# liveBroadcastContent etc. from the response, shrinking payload bytes and
+# JSON-parse time to roughly what the parser below actually reads.
+_VIDEO_FIELDS = "etag,items(id,snippet(title,description,channelTitle,channelId,tags,publishedAt),contentDetails/duration)"
+_CHANNEL_FIELDS = "items(id,snippet/thumbnails/default/url)"
+
+# Sentinel response for a 304 Not Modified conditional GET: the caller should
+# serve its cached records for that batch instead of parsing items.
+_NOT_MODIFIED = object()
+
+
+def _read_json_cache(path: str | None) -> dict:
+    """Load a JSON-dict cache file; missing or unreadable files yield {}."""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            loaded = json.load(f)
+        return loaded if isinstance(loaded, dict) else {}
+    except Exception as e:
+        print(f"Warning: could not read cache file {os.path.basename(path)}: {e}")
+        return {}
+
+
+def _write_json_cache(path: str | None, data: dict) -> None:
+    """Atomically persist a JSON-dict cache (tmp file + replace)."""
+    if not path:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Warning: could not write cache file {os.path.basename(path)}: {e}")
+
+
+class _OrjsonModel(JsonModel):
+    """JsonModel that decodes responses with orjson.
+
+    videos.list responses run to multiple MB per batch; orjson's C parser
+    decodes them several times faster than stdlib json and accepts the raw
+    bytes without a utf-8 decode pass.
+    """
+
+    def deserialize(self, content):
+        body = orjson.loads(content)
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
+
+class _RateLimiter:
+    """Spaces request starts across threads so aggregate QPS stays bounded.
+
+    Replaces the old per-batch time.sleep: each acquire() reserves the next
+    start slot under a lock, so concurrent workers collectively respect the
+    configured interval instead of each sleeping serially.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = max(0.0, float(min_interval))
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def acquire(self):
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class _RestHttpError(Exception):
+    """Non-2xx response from the direct REST path; carries the status code."""
+
+    def __init__(self, status: int, url: str, body: str = ''):
+        super().__init__(f"HTTP {status} for {url}: {body[:200]}")
+        self.status = status
+
+
+def _is_retryable(err: Exception) -> bool:
+    """True for transient responses (backpressure or server-side) worth retrying.
+
+    403 is only retryable for quota reasons; auth/permission 403s and 404s
+    stay terminal.
+    """
+    if isinstance(err, _RestHttpError):
+        status = err.status
+    elif isinstance(err, HttpError):
+        status = getattr(err.resp, 'status', None)
+    else:
+        return False
+    if status in (429, 500, 502, 503, 504):
+        return True
+    return status == 403 and 'quota' in str(err).lower()
+
+
 class YouTubeService:
     """A service class for interacting with the YouTube Data API v3."""
 
     def __init__(self, api_key: str):
         if not api_key:
             raise ValueError("YouTube API Key not provided.")
-        
+
         print("Building YouTube service object...")
         try:
-            self.youtube = build('youtube', 'v3', developerKey=api_key)
+            model = _OrjsonModel(data_wrapper=False) if orjson is not None else None
+            self.youtube = build('youtube', 'v3', developerKey=api_key, model=model)
             print("YouTube service object built successfully.")
         except Exception as e:
             print(f"Error building YouTube service object: {e}")
             raise
+        # Shared limiter: quota is per-unit, not per-concurrent-request, so
+        # overlapping round-trips is safe as long as total QPS stays polite
+        self._rate_limiter = _RateLimiter(config.YOUTUBE_API_DELAY)
+        self._api_key = api_key
+        self._thumb_cache: dict | None = None  # loaded lazily from disk
+        self._video_cache: dict | None = None  # loaded lazily from disk
+        self._etag_cache: dict | None = None  # loaded lazily from disk
+        self._local = threading.local()  # per-thread http handles (httplib2 is not thread-safe)
+        self._requested_ids: set[str] = set()
+        self._returned_ids: set[str] = set()
 
-    def fetch_video_details(self, video_ids: list[str]) -> list[dict]:
+    @property
+    def last_missing_ids(self) -> list[str]:
+        """Requested-but-not-returned ids from the most recent fetch.
+
+        Computed (and sorted) on access so runs that never inspect the
+        diagnostic don't pay for the set difference and sort.
+        """
+        return sorted(self._requested_ids - self._returned_ids)
+
+    def _thread_http(self):
+        """One httplib2 handle per worker thread.
+
+        The discovery client's default http object is shared and not
+        thread-safe; a per-thread handle is safe under the batch thread pool
+        and keeps its TCP/TLS connection alive across that thread's calls,
+        amortizing handshake cost the same way a pooled session would.
+        """
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = build_http()
+            self._local.http = http
+        return http
+
+    async def _arest_fetch(self, batches: list, resource: str, part: str,
+                           fields: str | None = None,
+                           etags: dict[int, str] | None = None,
+                           sink=None) -> tuple[dict, dict]:
+        """Fan out id-batched REST GETs over one pooled aiohttp session.
+
+        Skips the discovery client entirely: a shared TCPConnector reuses
+        TLS connections across all in-flight requests, so latency is one
+        RTT plus parse time rather than a handshake per call. When `sink`
+        is given, each batch's (idx, response, error) is pushed to it as
+        soon as that request settles, so callers can consume results while
+        the rest are still in flight.
+        """
+        responses: dict[int, dict] = {}
+        errors: dict[int, Exception] = {}
+        # Leaky bucket instead of fixed sleeps: the first YOUTUBE_RPS calls
+        # burst straight through, later ones drip at the configured rate
+        limiter = (AsyncLimiter(getattr(config, 'YOUTUBE_RPS', 10), 1)
+                   if AsyncLimiter is not None else None)
+        connector = aiohttp.TCPConnector(limit_per_host=64, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            async def _one(idx: int, batch: list[str]):
+                url = (f"https://www.googleapis.com/youtube/v3/{resource}"
+                       f"?part={part}&id={','.join(batch)}&maxResults=50&key={self._api_key}")
+                if fields:
+                    url += f"&fields={fields}"
+                etag = etags.get(idx) if etags else None
+                headers = {'If-None-Match': etag} if etag else None
+                response = None
+                error: Exception | None = None
+                try:
+                    if limiter is not None:
+                        await limiter.acquire()
+                    async with session.get(url, headers=headers) as resp:
+                        if resp.status == 304:
+                            response = _NOT_MODIFIED
+                        elif resp.status != 200:
+                            error = _RestHttpError(resp.status, url.split('&key=')[0],
+                                                   await resp.text())
+                        else:
+                            response = await resp.json(
+                                loads=orjson.loads if orjson is not None else json.loads)
+                except Exception as e:
+                    error = e
+                if error is not None:
+                    errors[idx] = error
+                else:
+                    responses[idx] = response
+                if sink is not None:
+                    sink(idx, response, error)
+            await asyncio.gather(*(_one(i, b) for i, b in enumerate(batches)))
+        return responses, errors
+
+    def _load_thumb_cache(self) -> dict:
+        """Load the persistent channelId -> {url, fetched_at} cache."""
+        if self._thumb_cache is None:
+            self._thumb_cache = _read_json_cache(getattr(config, 'CHANNEL_THUMBS_CACHE_PATH', None))
+        return self._thumb_cache
+
+    def _save_thumb_cache(self):
+        if self._thumb_cache is not None:
+            _write_json_cache(getattr(config, 'CHANNEL_THUMBS_CACHE_PATH', None), self._thumb_cache)
+
+    def _load_video_cache(self) -> dict:
+        """Load the persistent videoId -> {record, fetched_at} cache."""
+        if self._video_cache is None:
+            self._video_cache = _read_json_cache(getattr(config, 'VIDEO_DETAILS_CACHE_PATH', None))
+        return self._video_cache
+
+    def _save_video_cache(self):
+        if self._video_cache is not None:
+            _write_json_cache(getattr(config, 'VIDEO_DETAILS_CACHE_PATH', None), self._video_cache)
+
+    def _load_etag_cache(self) -> dict:
+        """Load the persistent batch-key -> response etag cache."""
+        if self._etag_cache is None:
+            self._etag_cache = _read_json_cache(getattr(config, 'VIDEO_ETAGS_CACHE_PATH', None))
+        return self._etag_cache
+
+    def _save_etag_cache(self):
+        if self._etag_cache is not None:
+            _write_json_cache(getattr(config, 'VIDEO_ETAGS_CACHE_PATH', None), self._etag_cache)
+
+    @staticmethod
+    def _batch_key(batch_ids: list[str]) -> str:
+        """Stable short key for an exact id batch (order-sensitive, like the etag)."""
+        return hashlib.sha1(','.join(batch_ids).encode()).hexdigest()
+
+    def _iter_multiplexed(self, batches: list, build_request, desc: str | None = None,
+                          rest: tuple[str, str, str] | None = None,
+                          etags: dict[int, str] | None = None):
+        """Yield (idx, response, error) for each batch as its result lands.
+
+        Same transports as before — pooled aiohttp fan-out when available,
+        multiplexed /batch POSTs through a thread pool otherwise — but
+        results surface in completion order, so callers can parse one batch
+        while the rest are still in flight instead of waiting behind a
+        blocking gather and holding every response in memory. Transient
+        failures (429/quota-403/5xx) are withheld and retried with jittered
+        backoff; each index is yielded exactly once with its final outcome.
+        """
+        if not batches:
+            return
+        retryable: dict[int, Exception] = {}
+        remaining = set(range(len(batches)))
+        group_size = max(1, getattr(config, 'YOUTUBE_BATCH_HTTP_SUBREQUESTS', 50))
+        workers = max(1, getattr(config, 'YOUTUBE_FETCH_WORKERS', 8))
+
+        def _execute_group(indices: list[int]) -> list[tuple]:
+            self._rate_limiter.acquire()
+            outcomes: list[tuple] = []
+
+            def _on_response(request_id, response, exception):
+                outcomes.append((int(request_id), response, exception))
+
+            batch_request = self.youtube.new_batch_http_request(callback=_on_response)
+            for idx in indices:
+                batch_request.add(build_request(batches[idx]), request_id=str(idx))
+            batch_request.execute(http=self._thread_http())
+            return outcomes
+
+        def _run_groups(idx_list: list[int], show_progress: bool):
+            groups = [idx_list[i:i + group_size] for i in range(0, len(idx_list), group_size)]
+            with ThreadPoolExecutor(max_workers=min(workers, len(groups))) as executor:
+                futures = {executor.submit(_execute_group, g): g for g in groups}
+                iterator = as_completed(futures)
+                if show_progress:
+                    iterator = tqdm(iterator, total=len(futures), desc=desc)
+                for future in iterator:
+                    try:
+                        yield from future.result()
+                    except Exception as e:
+                        # whole-group failure (transport-level); mark each member
+                        for idx in futures[future]:
+                            yield idx, None, e
+
+        # First pass: aiohttp fan-out on a side thread, streamed through a
+        # queue so each settled request reaches the caller immediately.
+        if (aiohttp is not None and rest is not None
+                and getattr(config, 'YOUTUBE_USE_AIOHTTP', True)):
+            results_q: "queue.Queue" = queue.Queue()
+
+            def _producer():
+                try:
+                    asyncio.run(self._arest_fetch(batches, *rest, etags=etags,
+                                                  sink=lambda *r: results_q.put(r)))
+                except Exception as e:
+                    print(f"Warning: aiohttp REST fetch failed ({e}); using batched client.")
+                finally:
+                    results_q.put(None)  # end-of-stream marker
+
+            threading.Thread(target=_producer, daemon=True).start()
+            while True:
+                item = results_q.get()
+                if item is None:
+                    break
+                idx, response, error = item
+                remaining.discard(idx)
+                if error is not None and _is_retryable(error):
+                    retryable[idx] = error
+                    continue
+                yield idx, response, error
+
+        # Batched-client pass for whatever the async path didn't deliver
+        # (dependency missing, disabled, or failed before completion)
+        if remaining:
+            for idx, response, error in _run_groups(sorted(remaining), bool(desc)):
+                if error is not None and _is_retryable(error):
+                    retryable[idx] = error
+                    continue
+                yield idx, response, error
+
+        # Reactive rate limiting: rather than pacing every request up front,
+        # retry only the batches the API pushed back on (429/quota) or failed
+        # transiently (5xx); jitter desynchronizes concurrent retry waves
+        for attempt in range(1, 6):
+            if not retryable:
+                break
+            retry_idx = sorted(retryable)
+            delay = min(2 ** attempt + random.random(), 32)
+            print(f"Transient errors on {len(retry_idx)} batch(es); retrying in {delay:.1f}s (attempt {attempt}/5)...")
+            time.sleep(delay)
+            still_retryable: dict[int, Exception] = {}
+            for idx, response, error in _run_groups(retry_idx, False):
+                if error is not None and _is_retryable(error) and attempt < 5:
+                    still_retryable[idx] = error
+                    continue
+                yield idx, response, error
+            retryable = still_retryable
+
+    def _execute_multiplexed(self, batches: list, build_request, desc: str | None = None,
+                             rest: tuple[str, str, str] | None = None,
+                             etags: dict[int, str] | None = None) -> tuple[dict, dict]:
+        """Materialized wrapper over _iter_multiplexed.
+
+        Returns ({idx: response}, {idx: exception}) keyed by each batch's
+        position in `batches`, for callers that want the whole result set.
+        """
+        responses: dict[int, dict] = {}
+        errors: dict[int, Exception] = {}
+        for idx, response, error in self._iter_multiplexed(batches, build_request, desc, rest, etags):
+            if error is not None:
+                errors[idx] = error
+            else:
+                responses[idx] = response
+        return responses, errors
+
+    def iter_video_details(self, video_ids: list[str]):
+        """Stream video detail records as each source (cache, API batch) parses.
+
+        Lets callers overlap downstream work (embedding, storage) with the
+        remaining fetches instead of waiting for the whole list. Records are
+        not thumbnail-enriched here; fetch_video_details layers that on top.
+        last_missing_ids reflects this fetch once the generator is exhausted.
+        """
         if not video_ids:
-            return []
+            self._requested_ids = set()
+            self._returned_ids = set()
+            return
+
+        # Dedupe while preserving first-seen order: a video added to Watch
+        # Later twice would otherwise cost quota twice per batch
+        video_ids = list(dict.fromkeys(v for v in video_ids if v))
 
-        all_video_details = []
         processed_count = 0
         error_count = 0
         requested_id_set = set(video_ids)
-        self.last_missing_ids = []  # will populate at end for external diagnostics
+        returned_overall: set[str] = set()
+        # Expose the live sets; last_missing_ids derives the sorted diff lazily
+        self._requested_ids = requested_id_set
+        self._returned_ids = returned_overall
 
         print(f"Fetching details for {len(video_ids)} YouTube video IDs...")
 
-        channel_ids: set[str] = set()
-
-        for i in tqdm(range(0, len(video_ids), config.YOUTUBE_API_BATCH_SIZE), desc="YouTube API Batches"):
-            batch_ids = video_ids[i:i + config.YOUTUBE_API_BATCH_SIZE]
-
-            try:
-                request = self.youtube.videos().list(
-                    part="snippet,contentDetails",
-                    id=",".join(batch_ids)
-                )
-                response = request.execute()
-
-                returned_ids_in_batch = set()
-                for item in response.get('items', []):
-                    snippet = item.get('snippet', {})
-                    content_details = item.get('contentDetails', {})
-                    video_id = item.get('id')
-                    channel_id = snippet.get('channelId') or None
-                    
-                    if video_id and snippet.get('title'):
-                        returned_ids_in_batch.add(video_id)
-                        if channel_id:
-                            channel_ids.add(channel_id)
-                        all_video_details.append({
-                            'id': video_id,
-                            'title': snippet.get('title'),
-                            'description': snippet.get('description', ''),
-                            'channel': snippet.get('channelTitle', ''),
-                            'channel_id': channel_id,
-                            'tags': snippet.get('tags', []),
-                            'publishedAt': snippet.get('publishedAt'),
-                            'duration': content_details.get('duration'),  # ISO 8601 duration
-                            'url': f'https://www.youtube.com/watch?v={video_id}'
-                        })
-                        processed_count += 1
-                    else:
-                        print(f"Warning: Skipping item with missing ID or Title. Data: {item}")
-                        error_count += 1
-
-                # Detect IDs that were requested but not returned (private, deleted, invalid, region blocked, etc.)
-                missing_from_batch = set(batch_ids) - returned_ids_in_batch
-                if missing_from_batch:
-                    sample_list = list(missing_from_batch)[:5]
-                    print(f"Info: {len(missing_from_batch)} IDs in this batch not returned by API (possibly private/deleted/unavailable). Sample: {sample_list}")
-                
-                time.sleep(config.YOUTUBE_API_DELAY)
-
-            except HttpError as e:
-                print(f"\nHTTP Error fetching batch: {e}")
-                if e.resp.status in [403, 404]:
-                    print("Critical API Error (likely quota, invalid key, or permissions). Stopping YouTube fetch.")
-                    break 
-                error_count += len(batch_ids)
+        # Snippet/contentDetails are effectively static per video; serve
+        # fresh disk-cache entries locally and only send misses to the API
+        video_cache = self._load_video_cache()
+        cache_ttl = getattr(config, 'VIDEO_DETAILS_TTL_DAYS', 7) * 86400
+        now = time.time()
+        to_fetch: list[str] = []
+        cached_records: list[dict] = []
+        stale_records: dict[str, dict] = {}  # expired entries, kept for etag revalidation
+        for vid in video_ids:
+            entry = video_cache.get(vid)
+            if isinstance(entry, dict) and isinstance(entry.get('record'), dict):
+                if now - entry.get('fetched_at', 0) < cache_ttl:
+                    cached_records.append(entry['record'])
+                    continue
+                stale_records[vid] = entry['record']
+            to_fetch.append(vid)
+        if cached_records:
+            print(f"Video details: {len(cached_records)} cached, fetching {len(to_fetch)}...")
+        for record in cached_records:
+            returned_overall.add(record['id'])
+            processed_count += 1
+            yield record
 
-            except Exception as e:
-                print(f"\nUnexpected Error fetching batch: {e}")
+        batches = [to_fetch[i:i + config.YOUTUBE_API_BATCH_SIZE]
+                   for i in range(0, len(to_fetch), config.YOUTUBE_API_BATCH_SIZE)]
+
+        def _build_request(batch_ids: list[str]):
+            return self.youtube.videos().list(
+                part="snippet,contentDetails",
+                fields=_VIDEO_FIELDS,
+                id=",".join(batch_ids)
+            )
+
+        # Conditional GETs: a batch whose members all have (expired) cached
+        # records and whose exact id grouping was fetched before can send
+        # If-None-Match; a 304 confirms freshness without re-transferring or
+        # re-parsing the payload. Batch composition is deterministic for
+        # repeat runs over the same source list, so the keys line up.
+        etag_cache = self._load_etag_cache()
+        etags: dict[int, str] = {}
+        for idx, batch_ids in enumerate(batches):
+            if all(v in stale_records for v in batch_ids):
+                etag = etag_cache.get(self._batch_key(batch_ids))
+                if etag:
+                    etags[idx] = etag
+
+        # Parse each batch as its result lands rather than gathering every
+        # response first: downstream work (embedding, thumbnails, storage)
+        # overlaps the remaining API round-trips and parsed payloads are
+        # released batch by batch instead of accumulating.
+        for idx, response, err in self._iter_multiplexed(
+                batches, _build_request, desc="YouTube API Batches",
+                rest=('videos', 'snippet,contentDetails', _VIDEO_FIELDS),
+                etags=etags or None):
+            batch_ids = batches[idx]
+            if err is not None:
+                if isinstance(err, HttpError):
+                    print(f"\nHTTP Error fetching batch: {err}")
+                    if err.resp.status in [403, 404]:
+                        print("Critical API Error (likely quota, invalid key, or permissions). Stopping YouTube fetch.")
+                        break
+                else:
+                    print(f"\nUnexpected Error fetching batch: {err}")
                 error_count += len(batch_ids)
-        
-        # Compute missing IDs overall (those not returned at all)
-        returned_overall = {d['id'] for d in all_video_details}
+                continue
+            if response is None:
+                error_count += len(batch_ids)
+                continue
+            if response is _NOT_MODIFIED:
+                # Server confirmed nothing changed; re-serve the cached
+                # records and re-stamp their freshness
+                for vid in batch_ids:
+                    record = stale_records[vid]
+                    video_cache[vid] = {'record': record, 'fetched_at': now}
+                    returned_overall.add(vid)
+                    processed_count += 1
+                    yield record
+                continue
+
+            new_etag = response.get('etag')
+            if new_etag:
+                etag_cache[self._batch_key(batch_ids)] = new_etag
+
+            returned_ids_in_batch = set()
+            for item in response.get('items', []):
+                snippet = item.get('snippet', {})
+                content_details = item.get('contentDetails', {})
+                video_id = item.get('id')
+                channel_id = snippet.get('channelId') or None
+
+                if video_id and snippet.get('title'):
+                    returned_ids_in_batch.add(video_id)
+                    returned_overall.add(video_id)
+                    record = {
+                        'id': video_id,
+                        'title': snippet.get('title'),
+                        'description': snippet.get('description', ''),
+                        'channel': snippet.get('channelTitle', ''),
+                        'channel_id': channel_id,
+                        'tags': snippet.get('tags', []),
+                        'publishedAt': snippet.get('publishedAt'),
+                        'duration': content_details.get('duration'),  # ISO 8601 duration
+                        # no 'url': it is a pure function of the id, derived at
+                        # the render sites instead of stored per record
+                    }
+                    video_cache[video_id] = {'record': record, 'fetched_at': now}
+                    processed_count += 1
+                    yield record
+                else:
+                    print(f"Warning: Skipping item with missing ID or Title. Data: {item}")
+                    error_count += 1
+
+            # Detect IDs that were requested but not returned (private, deleted, invalid, region blocked, etc.)
+            missing_from_batch = set(batch_ids) - returned_ids_in_batch
+            if missing_from_batch:
+                sample_list = list(missing_from_batch)[:5]
+                print(f"Info: {len(missing_from_batch)} IDs in this batch not returned by API (possibly private/deleted/unavailable). Sample: {sample_list}")
+
+        if to_fetch:
+            self._save_video_cache()
+            self._save_etag_cache()
+
+        # Report missing IDs overall (those not returned at all)
         total_missing = len(requested_id_set - returned_overall)
         if total_missing > 0:
-            self.last_missing_ids = sorted(list(requested_id_set - returned_overall))
             print(f"Summary: {total_missing} of {len(requested_id_set)} requested IDs not returned by API.")
-        else:
-            self.last_missing_ids = []
-        # Enrich with channel thumbnails (batch fetch)
-        try:
-            if channel_ids:
-                channel_thumb_map = self.fetch_channel_thumbnails(list(channel_ids))
-                for v in all_video_details:
-                    cid = v.get('channel_id')
-                    if cid and cid in channel_thumb_map:
-                        v['channel_thumbnail'] = channel_thumb_map[cid]
-        except Exception as enrich_e:
-            print(f"Warning: Failed to enrich channel thumbnails: {enrich_e}")
-
         print(f"Finished fetching YouTube details. Processed: {processed_count}, Errors/Skipped: {error_count}")
+
+    def fetch_video_details(self, video_ids: list[str]) -> list[dict]:
+        """Materialized wrapper over iter_video_details with thumbnail enrichment."""
+        all_video_details: list[dict] = []
+        channel_thumb_map: dict[str, str] = {}
+        seen_channels: set[str] = set()
+        pending_channels: list[str] = []
+        thumb_futures = []
+        # Fetch channel thumbnails on a side thread while later video batches
+        # are still in flight, instead of serially after the last one lands.
+        # A single worker keeps the thumb cache access serialized.
+        records_since_flush = 0
+        with ThreadPoolExecutor(max_workers=1) as thumb_pool:
+            for record in self.iter_video_details(video_ids):
+                all_video_details.append(record)
+                records_since_flush += 1
+                cid = record.get('channel_id')
+                if cid and cid not in seen_channels:
+                    seen_channels.add(cid)
+                    pending_channels.append(cid)
+                # Flush once per video batch worth of records, not only when a
+                # full batch of *unique* channels accumulates — otherwise the
+                # first channels.list wouldn't launch until several video
+                # batches in, defeating the overlap on cold ingests
+                if pending_channels and (len(pending_channels) >= config.YOUTUBE_API_BATCH_SIZE
+                                         or records_since_flush >= config.YOUTUBE_API_BATCH_SIZE):
+                    thumb_futures.append(thumb_pool.submit(self.fetch_channel_thumbnails, pending_channels))
+                    pending_channels = []
+                    records_since_flush = 0
+            if pending_channels:
+                thumb_futures.append(thumb_pool.submit(self.fetch_channel_thumbnails, pending_channels))
+            for fut in thumb_futures:
+                try:
+                    channel_thumb_map.update(fut.result())
+                except Exception as enrich_e:
+                    print(f"Warning: Failed to enrich channel thumbnails: {enrich_e}")
+
+        if not all_video_details:
+            return []
+
+        for v in all_video_details:
+            cid = v.get('channel_id')
+            if cid and cid in channel_thumb_map:
+                v['channel_thumbnail'] = channel_thumb_map[cid]
+
         return all_video_details
 
     def fetch_channel_thumbnails(self, channel_ids: list[str]) -> dict[str, str]:
@@ -122,27 +599,48 @@ class YouTubeService:
         result: dict[str, str] = {}
         # Deduplicate & batch
         unique_ids = list(dict.fromkeys([cid for cid in channel_ids if cid]))
-        for i in range(0, len(unique_ids), config.YOUTUBE_API_BATCH_SIZE):
-            batch = unique_ids[i:i + config.YOUTUBE_API_BATCH_SIZE]
-            try:
-                request = self.youtube.channels().list(part="snippet", id=",".join(batch))
-                response = request.execute()
-                for item in response.get('items', []):
-                    cid = item.get('id')
-                    snippet = item.get('snippet', {})
-                    thumbs = (snippet.get('thumbnails') or {}) if isinstance(snippet, dict) else {}
-                    # Preferred order: high, medium, default
-                    thumb_url = None
-                    for key in ('high', 'medium', 'default'):
-                        if key in thumbs and isinstance(thumbs[key], dict):
-                            thumb_url = thumbs[key].get('url')
-                            if thumb_url:
-                                break
-                    if cid and thumb_url:
-                        result[cid] = thumb_url
-                time.sleep(config.YOUTUBE_API_DELAY)
-            except HttpError as e:
-                print(f"Channel thumbnails HTTP error: {e}")
-            except Exception as e:
-                print(f"Unexpected error fetching channel thumbnails: {e}")
+        # Thumbnails change rarely; serve from the disk cache and only hit
+        # the channels API for ids that are missing or stale
+        cache = self._load_thumb_cache()
+        ttl_seconds = getattr(config, 'CHANNEL_THUMBS_TTL_DAYS', 30) * 86400
+        now = time.time()
+        miss_ids = []
+        for cid in unique_ids:
+            entry = cache.get(cid)
+            if isinstance(entry, dict) and entry.get('url') and now - entry.get('fetched_at', 0) < ttl_seconds:
+                result[cid] = entry['url']
+            else:
+                miss_ids.append(cid)
+        if not miss_ids:
+            return result
+        print(f"Channel thumbnails: {len(result)} cached, fetching {len(miss_ids)}...")
+        batches = [miss_ids[i:i + config.YOUTUBE_API_BATCH_SIZE]
+                   for i in range(0, len(miss_ids), config.YOUTUBE_API_BATCH_SIZE)]
+
+        def _build_request(batch: list[str]):
+            return self.youtube.channels().list(part="snippet", fields=_CHANNEL_FIELDS, id=",".join(batch))
+
+        responses, errors = self._execute_multiplexed(batches, _build_request,
+                                                      rest=('channels', 'snippet', _CHANNEL_FIELDS))
+        for idx in range(len(batches)):
+            err = errors.get(idx)
+            if err is not None:
+                if isinstance(err, HttpError):
+                    print(f"Channel thumbnails HTTP error: {err}")
+                else:
+                    print(f"Unexpected error fetching channel thumbnails: {err}")
+                continue
+            response = responses.get(idx)
+            if not response:
+                continue
+            for item in response.get('items', []):
+                cid = item.get('id')
+                # Only the default (88px) size is requested now — the UI
+                # renders a small avatar, so no quality probing needed
+                thumbs = (item.get('snippet') or {}).get('thumbnails') or {}
+                thumb_url = (thumbs.get('default') or {}).get('url')
+                if cid and thumb_url:
+                    result[cid] = thumb_url
+                    cache[cid] = {'url': thumb_url, 'fetched_at': now}
+        self._save_thumb_cache()
         return result
@@ -228,7 +228,7 @@ document.addEventListener("DOMContentLoaded", () => {
                 card.innerHTML = `
                     <div class="card video-card h-100">
                         <div class="position-relative thumb-wrapper">
-                            <img src="${video.thumbnail || 'https://via.placeholder.com/480x360?text=No+Thumbnail'}" class="card-img-top" alt="${video.title}" loading="lazy">
+                            <img src="${video.thumbnail || 'https://via.placeholder.com/480x360?text=No+Thumbnail'}" class="card-img-top" alt="${video.title}" loading="lazy" decoding="async">
                             <span class="score-badge ${scoreClass}">${video.score.toFixed(3)}</span>
                         </div>
                         <div class="card-body">
@@ -264,7 +264,7 @@ document.addEventListener("DOMContentLoaded", () => {
                 const channelUrl = channelId ? `https://www.youtube.com/channel/${channelId}` : `https://www.youtube.com/results?search_query=${encodeURIComponent(video.channel || '')}`;
                 if (url) {
                     return `<a href="${channelUrl}" target="_blank" class="channel-avatar-link" aria-label="Open ${safeName} channel on YouTube" rel="noopener">` +
-                        `<img src="${url}" class="channel-avatar" alt="${safeName} channel avatar" loading="lazy" onerror="this.onerror=null;this.replaceWith(App.Results.fallbackAvatar('${safeName}'));" />` +
+                        `<img src="${url}" class="channel-avatar" alt="${safeName} channel avatar" loading="lazy" decoding="async" onerror="this.onerror=null;this.replaceWith(App.Results.fallbackAvatar('${safeName}'));" />` +
                         `</a>`;
                 }
                 return `<a href="${channelUrl}" target="_blank" class="channel-avatar-link" aria-label="Open ${safeName} channel on YouTube" rel="noopener">${this.fallbackAvatar(safeName)}</a>`;
@@ -273,7 +273,7 @@ document.addEventListener("DOMContentLoaded", () => {
                 const url = video.channel_thumbnail;
                 const safeName = App.Utils.escapeHtml(video.channel || '');
                 if (url) {
-                    return `<img src="${url}" class="channel-avatar" alt="${safeName} channel avatar" loading="lazy" onerror="this.onerror=null;this.replaceWith(App.Results.fallbackAvatar('${safeName}'));" />`;
+                    return `<img src="${url}" class="channel-avatar" alt="${safeName} channel avatar" loading="lazy" decoding="async" onerror="this.onerror=null;this.replaceWith(App.Results.fallbackAvatar('${safeName}'));" />`;
                 }
                 return this.fallbackAvatar(safeName);
             }